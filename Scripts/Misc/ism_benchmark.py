@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+ISM Policy Analyzer Benchmark
+Runs ism_policy_analyzer.py against seeded synthetic explain dumps of increasing size and
+reports wall time, peak RSS and per-phase timings (index sizes, load, classify, render).
+
+Features:
+- Generates missing dumps with ism_synthetic_dump.py (reused on later runs)
+- Runs every size in a fresh subprocess so peak RSS is measured per size
+- Benchmarks the in-memory, --stream and --workers code paths
+- Optional JSON output for comparing runs
+
+Usage:
+    python ism_benchmark.py
+    python3 ism_benchmark.py --sizes 10000,100000 --stream --workers 4 --json bench.json
+"""
+
+import json
+import os
+import sys
+import time
+import argparse
+import subprocess
+import tempfile
+import contextlib
+from typing import Dict, List, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from ism_synthetic_dump import SyntheticDumpGenerator
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SIZES = (10000, 100000, 1000000)
+PHASES = ('index_sizes', 'load', 'classify', 'render')
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of the current process in MB (0 when unavailable)"""
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_single(dump_file: str, cat_file: str, output_dir: str, stream: bool, workers: int) -> Dict:
+    """Analyze one dump in the current process and return the measured phase timings"""
+    from ism_policy_analyzer import ISMPolicyAnalyzer
+
+    timings = {}
+    start = time.perf_counter()
+    # The analyzer reports progress on stdout, which is reserved for the result line here
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        phase_start = time.perf_counter()
+        analyzer = ISMPolicyAnalyzer(dump_file, stream=stream, workers=workers)
+        if cat_file:
+            analyzer.index_sizes = analyzer._load_index_sizes(cat_file)
+        timings['index_sizes'] = time.perf_counter() - phase_start
+
+        phase_start = time.perf_counter()
+        if not analyzer.load_data():
+            raise RuntimeError(f"Could not load {dump_file}")
+        timings['load'] = time.perf_counter() - phase_start
+
+        phase_start = time.perf_counter()
+        results = analyzer.analyze_all_indices()
+        timings['classify'] = time.perf_counter() - phase_start
+
+        phase_start = time.perf_counter()
+        analyzer.generate_report(os.path.join(output_dir, 'bench_report.md'))
+        analyzer.generate_recommendations(os.path.join(output_dir, 'bench_recommendations.md'))
+        timings['render'] = time.perf_counter() - phase_start
+
+    return {
+        'indices': results['total_indices'],
+        'failed': results['summary']['failed'],
+        'pending': results['summary']['pending'],
+        'wall_seconds': time.perf_counter() - start,
+        'peak_rss_mb': peak_rss_mb(),
+        'phases': timings
+    }
+
+
+def ensure_dump(size: int, data_dir: str, seed: int) -> Tuple[str, str]:
+    """Return (explain dump, _cat/indices file) for the given size, generating them if needed"""
+    dump_file = os.path.join(data_dir, f"explain_{size}_seed{seed}.json")
+    cat_file = os.path.join(data_dir, f"cat_indices_{size}_seed{seed}.txt")
+    if not (os.path.exists(dump_file) and os.path.exists(cat_file)):
+        print(f"🔧 Generating {size} synthetic indices...")
+        SyntheticDumpGenerator(indices=size, seed=seed).write(dump_file, cat_file)
+    return dump_file, cat_file
+
+
+def run_benchmark(sizes: List[int], data_dir: str, seed: int, stream: bool, workers: int,
+                  with_sizes: bool) -> List[Dict]:
+    """Benchmark every size in its own interpreter so peak RSS does not carry over"""
+    os.makedirs(data_dir, exist_ok=True)
+    results = []
+    for size in sizes:
+        dump_file, cat_file = ensure_dump(size, data_dir, seed)
+        command = [sys.executable, os.path.abspath(__file__), '--child', dump_file,
+                   '--data-dir', data_dir, '--workers', str(workers)]
+        if with_sizes:
+            command += ['--child-cat', cat_file]
+        if stream:
+            command.append('--stream')
+        print(f"⏱️  Benchmarking {size} indices...")
+        completed = subprocess.run(command, capture_output=True, text=True, cwd=SCRIPT_DIR)
+        if completed.returncode != 0:
+            print(f"❌ Benchmark for {size} indices failed:\n{completed.stderr}")
+            continue
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        result['size'] = size
+        results.append(result)
+    return results
+
+
+def print_results(results: List[Dict], stream: bool, workers: int):
+    mode = 'stream' if stream else 'in-memory'
+    print("\n" + "=" * 80)
+    print(f"ISM ANALYZER BENCHMARK ({mode}, workers={workers})")
+    print("=" * 80)
+    header = f"{'Indices':>10} {'Wall (s)':>9} {'Peak RSS (MB)':>14}"
+    for phase in PHASES:
+        header += f" {phase + ' (s)':>16}"
+    print(header)
+    for result in results:
+        line = f"{result['size']:>10} {result['wall_seconds']:>9.2f} {result['peak_rss_mb']:>14.1f}"
+        for phase in PHASES:
+            line += f" {result['phases'][phase]:>16.3f}"
+        print(line)
+    print("=" * 80)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark ism_policy_analyzer.py on synthetic explain dumps",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python ism_benchmark.py
+  python ism_benchmark.py --sizes 10000,100000 --stream
+  python ism_benchmark.py --sizes 1000000 --workers 8 --json bench_1m.json
+        """
+    )
+
+    parser.add_argument('--sizes', default=','.join(str(s) for s in DEFAULT_SIZES),
+                        help='Comma separated index counts (default: 10000,100000,1000000)')
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'ism_bench_data'),
+                        help='Directory for generated dumps and rendered output, kept for later runs '
+                             '(default: ism_bench_data in the system temp directory)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed for generated dumps (default: 42)')
+    parser.add_argument('--stream', action='store_true', help='Benchmark the streaming parser')
+    parser.add_argument('--workers', '-w', type=int, default=1, help='Classifier worker processes (default: 1)')
+    parser.add_argument('--no-index-sizes', action='store_true', help='Skip loading the _cat/indices file')
+    parser.add_argument('--json', help='Also write the results as JSON to this file')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    parser.add_argument('--child-cat', help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+
+    if args.child:
+        result = run_single(args.child, args.child_cat, args.data_dir, args.stream, args.workers)
+        print(json.dumps(result))
+        return
+
+    try:
+        sizes = [int(s) for s in args.sizes.split(',') if s.strip()]
+    except ValueError:
+        print(f"❌ Error: Invalid --sizes value '{args.sizes}'.")
+        sys.exit(1)
+    if args.workers < 1:
+        print("❌ Error: --workers must be at least 1.")
+        sys.exit(1)
+
+    results = run_benchmark(sizes, args.data_dir, args.seed, args.stream, args.workers,
+                            not args.no_index_sizes)
+    print_results(results, args.stream, args.workers)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"✅ Results saved to: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
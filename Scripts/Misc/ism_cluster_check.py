@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+ISM Cluster Source Check
+Serves a synthetic explain dump from a local stub of the `_plugins/_ism/explain` API and
+checks ism_policy_analyzer.py's ClusterExplainSource (--cluster) against it.
+
+Features:
+- Pages are fetched in order over at most --concurrency pooled keep-alive connections
+- Index patterns are requested as /_plugins/_ism/explain/<pattern>
+- A pooled connection closed by the cluster is retried once on a fresh connection
+- HTTP errors, invalid JSON and unreachable clusters raise ClusterFetchError
+- --cluster reports and exports match those of a file run on the same dump
+
+Usage:
+    python ism_cluster_check.py
+    python3 ism_cluster_check.py --indices 20000 --page-size 250 --concurrency 8
+"""
+
+import base64
+import fnmatch
+import json
+import math
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import argparse
+import urllib.parse
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, List, Optional, Tuple
+
+from ism_policy_analyzer import ClusterExplainSource, ClusterFetchError
+from ism_synthetic_dump import SyntheticDumpGenerator
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ANALYZER = os.path.join(SCRIPT_DIR, 'ism_policy_analyzer.py')
+EXPLAIN_PATH = ClusterExplainSource.EXPLAIN_PATH
+STUB_AUTH = 'analyst:secret'
+# Report lines that name the input, so they differ between file and cluster runs
+VOLATILE_PREFIXES = ('**Source File:**',)
+
+
+class StubExplainHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 keeps connections open between requests, like a cluster does
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        url = urllib.parse.urlsplit(self.path)
+        with server.lock:
+            server.requests.append((self.path, self.headers.get('Authorization')))
+        status = 200
+        if server.fail_status:
+            status = server.fail_status
+            body = b'{"error": "stub failure"}'
+        elif server.invalid_json:
+            body = b'{"total_managed_indices": '
+        elif url.path != EXPLAIN_PATH and not url.path.startswith(EXPLAIN_PATH + '/'):
+            status = 404
+            body = b'{"error": "no handler found"}'
+        else:
+            query = urllib.parse.parse_qs(url.query)
+            pattern = urllib.parse.unquote(url.path[len(EXPLAIN_PATH) + 1:]) or None
+            body = server.page(pattern, int(query['from'][0]), int(query['size'][0]))
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        if server.drop_connections:
+            # Close without a Connection: close header, like an idle timeout on the cluster side
+            self.close_connection = True
+
+
+class StubExplainServer(ThreadingHTTPServer):
+    """Serves explain pages (from/size, optional comma separated index patterns) from a list of entries"""
+
+    daemon_threads = True
+
+    def __init__(self, entries: List[Tuple[str, Any]]):
+        super().__init__(('127.0.0.1', 0), StubExplainHandler)
+        self.entries = entries
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Clear the request counters and injected failures"""
+        self.connections = 0
+        self.requests = []
+        self.fail_status = None
+        self.invalid_json = False
+        self.drop_connections = False
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def matching(self, pattern: Optional[str]) -> List[Tuple[str, Any]]:
+        if not pattern:
+            return self.entries
+        patterns = pattern.split(',')
+        return [(name, value) for name, value in self.entries if any(fnmatch.fnmatchcase(name, p) for p in patterns)]
+
+    def page(self, pattern: Optional[str], offset: int, size: int) -> bytes:
+        entries = self.matching(pattern)
+        page = dict(entries[offset:offset + size])
+        page['total_managed_indices'] = len(entries)
+        return json.dumps(page).encode('utf-8')
+
+
+def expect_fetch_error(call: Callable, fragment: str) -> str:
+    try:
+        call()
+    except ClusterFetchError as e:
+        assert fragment in str(e), f"unexpected error: {e}"
+        return str(e)
+    raise AssertionError("no ClusterFetchError raised")
+
+
+def check_pooled_paging(server: StubExplainServer, page_size: int, concurrency: int) -> str:
+    source = ClusterExplainSource(server.url, page_size=page_size, concurrency=concurrency, auth=STUB_AUTH)
+    try:
+        pairs = list(source.iter_entries())
+    finally:
+        source.close()
+    assert pairs == server.entries + [('total_managed_indices', len(server.entries))], \
+        "entries differ from the dump or are out of order"
+    pages = max(1, math.ceil(len(server.entries) / page_size))
+    assert len(server.requests) == pages, f"{len(server.requests)} requests for {pages} pages"
+    assert server.connections <= concurrency, \
+        f"{server.connections} connections opened for --fetch-concurrency {concurrency}"
+    expected_auth = 'Basic ' + base64.b64encode(STUB_AUTH.encode('utf-8')).decode('ascii')
+    assert all(auth == expected_auth for _, auth in server.requests), "missing or wrong Authorization header"
+    return f"{len(server.entries)} entries in {pages} pages over {server.connections} connection(s)"
+
+
+def check_index_patterns(server: StubExplainServer, page_size: int, concurrency: int) -> str:
+    patterns = ['logs-app1*', '.logs-*']
+    source = ClusterExplainSource(server.url, page_size=page_size, concurrency=concurrency, index_patterns=patterns)
+    try:
+        pairs = list(source.iter_entries())
+    finally:
+        source.close()
+    expected = [pair for pattern in patterns for pair in server.matching(pattern)]
+    assert pairs == expected + [('total_managed_indices', len(expected))], "entries differ from the patterns' pages"
+    paths = {urllib.parse.urlsplit(path).path for path, _ in server.requests}
+    assert paths == {f"{EXPLAIN_PATH}/{pattern}" for pattern in patterns}, f"unexpected paths: {sorted(paths)}"
+    return f"{len(expected)} entries for {', '.join(patterns)}"
+
+
+def check_reconnect(server: StubExplainServer) -> str:
+    server.drop_connections = True
+    source = ClusterExplainSource(server.url, page_size=10, concurrency=1)
+    try:
+        for _ in range(3):
+            source.get_json(f"{EXPLAIN_PATH}?from=0&size=10")
+    finally:
+        source.close()
+    assert server.connections == 3, f"{server.connections} connections for 3 requests on dropped connections"
+    return "3 requests after the cluster closed each pooled connection"
+
+
+def check_http_error(server: StubExplainServer) -> str:
+    server.fail_status = 503
+    source = ClusterExplainSource(server.url)
+    try:
+        expect_fetch_error(lambda: list(source.iter_entries()), 'HTTP 503')
+        # The failed response's connection is not reused
+        server.fail_status = None
+        source.get_json(f"{EXPLAIN_PATH}?from=0&size=1")
+    finally:
+        source.close()
+    assert server.connections == 2, f"{server.connections} connections, expected a new one after the error"
+    return "HTTP 503 raised ClusterFetchError"
+
+
+def check_invalid_json(server: StubExplainServer) -> str:
+    server.invalid_json = True
+    source = ClusterExplainSource(server.url)
+    try:
+        expect_fetch_error(lambda: list(source.iter_entries()), 'invalid JSON')
+    finally:
+        source.close()
+    return "truncated body raised ClusterFetchError"
+
+
+def check_unreachable(server: StubExplainServer) -> str:
+    # A port that was just free is very unlikely to be taken again right away
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        port = probe.getsockname()[1]
+    source = ClusterExplainSource(f"http://127.0.0.1:{port}", timeout=5)
+    try:
+        expect_fetch_error(lambda: list(source.iter_entries()), 'failed')
+    finally:
+        source.close()
+    try:
+        ClusterExplainSource('ftp://cluster.example')
+    except ValueError:
+        return "refused connection raised ClusterFetchError, non-HTTP URL raised ValueError"
+    raise AssertionError("no ValueError for a non-HTTP URL")
+
+
+def run_pinned_analyzer(now: float, arguments: List[str]):
+    """Run ism_policy_analyzer.py's main() with datetime.now() pinned to the given timestamp"""
+    import ism_policy_analyzer
+
+    class PinnedDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime.fromtimestamp(now, tz)
+
+    ism_policy_analyzer.datetime = PinnedDatetime
+    sys.argv = [ANALYZER] + arguments
+    ism_policy_analyzer.main()
+
+
+def run_analyzer(arguments: List[str], now: Optional[float] = None) -> subprocess.CompletedProcess:
+    if now is None:
+        now = datetime.now().timestamp()
+    # The analyzer runs in a child process of this script, which pins its clock (see run_pinned_analyzer)
+    command = [sys.executable, os.path.abspath(__file__), '--child-now', str(now), '--']
+    return subprocess.run(command + arguments, capture_output=True, text=True, cwd=SCRIPT_DIR)
+
+
+def read_stable_lines(path: str) -> List[str]:
+    with open(path) as f:
+        return [line for line in f if not line.startswith(VOLATILE_PREFIXES)]
+
+
+def check_cli_parity(server: StubExplainServer, dump_file: str, work_dir: str, page_size: int,
+                     concurrency: int) -> str:
+    outputs = ('report.md', 'recommendations.md', 'export.csv')
+    runs = {
+        'file': [dump_file],
+        'cluster': ['--cluster', server.url, '--page-size', str(page_size),
+                    '--fetch-concurrency', str(concurrency)],
+    }
+    # Index ages are measured from now; both runs use the same now, so ages cannot round differently
+    now = datetime.now().timestamp()
+    for name, arguments in runs.items():
+        paths = [os.path.join(work_dir, f"{name}_{output}") for output in outputs]
+        completed = run_analyzer(arguments + ['--report', paths[0], '--recommendations', paths[1],
+                                              '--export', paths[2], '--export-format', 'csv'], now)
+        assert completed.returncode == 0, f"{name} run failed:\n{completed.stdout}{completed.stderr}"
+    for output in outputs:
+        file_lines = read_stable_lines(os.path.join(work_dir, f"file_{output}"))
+        cluster_lines = read_stable_lines(os.path.join(work_dir, f"cluster_{output}"))
+        assert file_lines == cluster_lines, f"{output} differs between the file and --cluster runs"
+    return f"{', '.join(outputs)} identical"
+
+
+def check_cli_error(server: StubExplainServer) -> str:
+    server.fail_status = 500
+    completed = run_analyzer(['--cluster', server.url, '--summary'])
+    assert completed.returncode == 1, f"exit code {completed.returncode}"
+    assert '❌ Error: GET' in completed.stdout, f"no error message:\n{completed.stdout}{completed.stderr}"
+    return "--cluster exits with 1 and reports the failed request"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check ism_policy_analyzer.py's --cluster source against a stub explain API",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python ism_cluster_check.py
+  python ism_cluster_check.py --indices 20000 --page-size 250 --concurrency 8
+        """
+    )
+
+    parser.add_argument('--indices', '-n', type=int, default=3000, help='Number of managed indices (default: 3000)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed for the generated dump (default: 42)')
+    parser.add_argument('--page-size', type=int, default=100, help='Indices per explain page (default: 100)')
+    parser.add_argument('--concurrency', type=int, default=4, help='Concurrent page requests (default: 4)')
+    parser.add_argument('--child-now', type=float, help=argparse.SUPPRESS)
+    parser.add_argument('child_args', nargs=argparse.REMAINDER, help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+
+    if args.child_now is not None:
+        child_args = args.child_args[1:] if args.child_args[:1] == ['--'] else args.child_args
+        run_pinned_analyzer(args.child_now, child_args)
+        return
+
+    if args.indices < 1 or args.page_size < 1 or args.concurrency < 1:
+        print("❌ Error: --indices, --page-size and --concurrency must be at least 1.")
+        sys.exit(1)
+
+    with tempfile.TemporaryDirectory(prefix='ism_cluster_check_') as work_dir:
+        dump_file = os.path.join(work_dir, 'explain.json')
+        SyntheticDumpGenerator(indices=args.indices, seed=args.seed).write(dump_file)
+        with open(dump_file) as f:
+            dump = json.load(f)
+        dump.pop('total_managed_indices')
+
+        server = StubExplainServer(list(dump.items()))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        checks = [
+            ('Pooled paging', lambda: check_pooled_paging(server, args.page_size, args.concurrency)),
+            ('Index patterns', lambda: check_index_patterns(server, args.page_size, args.concurrency)),
+            ('Reconnect', lambda: check_reconnect(server)),
+            ('HTTP error', lambda: check_http_error(server)),
+            ('Invalid JSON', lambda: check_invalid_json(server)),
+            ('Unreachable cluster', lambda: check_unreachable(server)),
+            ('--cluster matches file run',
+             lambda: check_cli_parity(server, dump_file, work_dir, args.page_size, args.concurrency)),
+            ('--cluster error exit', lambda: check_cli_error(server)),
+        ]
+        failures = 0
+        try:
+            for name, check in checks:
+                server.reset()
+                try:
+                    print(f"✅ {name}: {check()}")
+                except Exception as e:
+                    failures += 1
+                    print(f"❌ {name}: {e}")
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    if failures:
+        print(f"\n❌ {failures} of {len(checks)} checks failed.")
+        sys.exit(1)
+    print(f"\n✅ All {len(checks)} checks passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,76 +10,1032 @@ Features:
 - Provides detailed failure analysis including circuit breaker errors
 - Generates actionable recommendations
 - Supports both console output and detailed markdown reports
+- Optional streaming mode that parses the explain dump one index at a time
+- Parallel parsing and classification of byte ranges of the dump in a process pool (--workers)
+- Incremental runs against a SQLite snapshot with delta reports (--snapshot)
+- Live polling of _plugins/_ism/explain from a cluster (--cluster)
+- Machine-readable per-index exports as JSON Lines, CSV or Parquet (--export)
+- Fleet-wide batch analysis of many clusters in one process pool (--batch)
+- Resident watch mode for a directory of rotating dumps with a Prometheus endpoint (--watch)
+- Forecasts pending rollovers per policy and flags indices stuck behind unreachable conditions
+- Fast status counts for scripts and alert hooks without a full analysis (--counts)
+- Per-phase timing metrics as JSON with optional cProfile/tracemalloc capture (--metrics, --profile)
 
 Usage:
     python ism_policy_analyzer.py <path_to_json_file>
     python ism_policy_analyzer.py /path/to/index_ism_policy.json
     python3 ism_policy_analyzer.py dev_index_ism_policy.json --index-size-csv dev_index_size.csv --report dev_detailed_analysis_with_age.md
+    python3 ism_policy_analyzer.py prod_index_ism_policy.json --stream --summary
+    python3 ism_policy_analyzer.py --cluster https://localhost:9200 --index-size-csv dev_index_size.csv --summary
 """
 
 import json
+import re
 import sys
 import os
+import mmap
+import zlib
+import hashlib
+import marshal
+import heapq
+import math
+import time
+import functools
+from contextlib import contextmanager
+from array import array
+from bisect import bisect_left, bisect_right
 from datetime import datetime, timezone
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Iterator, Iterable, Any, Callable
+from collections import deque, Counter
+from itertools import islice, chain
 import argparse
 
+# Modules only needed by --snapshot, --cluster, --export, --workers, --batch, --watch and
+# --profile (sqlite3, ssl, http.client, concurrent.futures, csv, cProfile, ...) are imported
+# where they are used, so plain --summary and --counts runs start quickly.
 
-class ISMPolicyAnalyzer:
-    def get_index_age_days(self, index_data: Dict) -> str:
-        """Calculate index age in days from creation_date to today."""
-        creation_ts = index_data.get('creation_date')
-        if not creation_ts:
-            return "Unknown"
+
+# Layout of --snapshot files; older snapshots are discarded (bump when the record tuple changes)
+SNAPSHOT_FORMAT = 2
+# Streamed value of an entry whose raw text is the same as in the previous snapshot (not decoded)
+UNCHANGED_ENTRY = object()
+# Size of each read when streaming the explain dump (characters, not bytes)
+STREAM_CHUNK_SIZE = 1 << 20
+JSON_WHITESPACE = ' \t\n\r'
+JSON_NON_WHITESPACE = re.compile(r'[^ \t\n\r]')
+# A decode error this close to the end of the buffer may just be a value cut off by the chunk edge
+STREAM_TRUNCATION_MARGIN = 16
+# Bytes of the explain dump parsed and classified by a worker process per task in --workers mode
+RANGE_BYTES = 4 << 20
+# Where a top-level entry may start in the middle of a dump: a key after a comma whose value is an object
+ENTRY_CANDIDATE = re.compile(r',\s*("(?:[^"\\]|\\.)*")\s*:\s*\{')
+# Write buffer for streamed report files
+REPORT_BUFFER_SIZE = 1 << 16
+# Rows per record batch when writing Parquet exports
+EXPORT_BATCH_SIZE = 65536
+# Columns of the machine-readable exports (--export)
+EXPORT_FIELDS = ('index', 'policy', 'state', 'operation', 'status', 'failure_class', 'breaker_type',
+                 'size_bytes', 'age_days', 'retries', 'enabled')
+EXPORT_FORMATS = {'.jsonl': 'jsonl', '.ndjson': 'jsonl', '.csv': 'csv', '.parquet': 'parquet'}
+# Number of indices listed in each "worst offenders" ranking
+TOP_OFFENDERS = 10
+# Upper bounds (bytes) of the per-policy size histogram buckets; the last bucket is open-ended
+SIZE_HISTOGRAM_BOUNDS = (1 << 30, 10 << 30, 50 << 30, 100 << 30, 500 << 30)
+SIZE_HISTOGRAM_LABELS = ('<1gb', '1-10gb', '10-50gb', '50-100gb', '100-500gb', '>=500gb', 'unknown')
+# "Due within" horizons (days) of the rollover forecast and number of upcoming rollovers listed
+FORECAST_HORIZONS = ((1, '24 hours'), (7, '7 days'), (30, '30 days'))
+FORECAST_ROWS = 20
+
+
+class _StreamingObjectReader:
+    """Minimal incremental tokenizer over a text file holding one large JSON object.
+
+    Only the top-level structure (braces, keys, colons, commas) is tokenized here;
+    each value is handed to json.JSONDecoder.raw_decode, so at most one index
+    entry plus one read chunk is held in memory at a time.
+    """
+
+    def __init__(self, file_obj, chunk_size: int = STREAM_CHUNK_SIZE):
+        self.file_obj = file_obj
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buf = ''
+        self.pos = 0
+        # Characters dropped from the front of the buffer so far (buf[0] is character `offset` of the read)
+        self.offset = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        """Drop the consumed prefix of the buffer and append the next chunk"""
+        if self.eof:
+            return False
+        chunk = self.file_obj.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.offset += self.pos
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character ('' at end of file)"""
+        if self.pos < len(self.buf) and self.buf[self.pos] not in JSON_WHITESPACE:
+            return self.buf[self.pos]
+        while True:
+            match = JSON_NON_WHITESPACE.search(self.buf, self.pos)
+            if match:
+                self.pos = match.start()
+                return self.buf[self.pos]
+            self.pos = len(self.buf)
+            if not self._fill():
+                return ''
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", self.buf, self.pos)
+        self.pos += 1
+
+    def peek_text(self, length: int) -> Optional[str]:
+        """Return the next length characters without consuming them (None if the file ends first)"""
+        self.peek()
+        while len(self.buf) - self.pos < length:
+            if not self._fill():
+                return None
+        return self.buf[self.pos:self.pos + length]
+
+    def decode_value(self, with_text: bool = False) -> Any:
+        """Decode the next JSON value, reading more chunks until it is complete.
+
+        With with_text, return (value, raw JSON text of the value).
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError as e:
+                # Only errors caused by the end of the buffer can go away with more data; anything
+                # else is malformed input, and reading on would pull the rest of the file into memory
+                truncated = (e.msg.startswith('Unterminated string')
+                             or e.pos >= len(self.buf) - STREAM_TRUNCATION_MARGIN)
+                if truncated and self._fill():
+                    continue
+                raise
+            # A number or literal ending exactly at the buffer edge may continue in the next chunk
+            if end == len(self.buf) and self._fill():
+                continue
+            text = self.buf[self.pos:end] if with_text else None
+            self.pos = end
+            return (value, text) if with_text else value
+
+
+def iter_explain_entries(file_path: str, chunk_size: int = STREAM_CHUNK_SIZE, fingerprints: bool = False,
+                         known: Optional[Callable[[str], Optional[Tuple[int, bytes]]]] = None) -> Iterator[Tuple]:
+    """Yield (key, value) pairs of the top-level explain object without loading the whole file.
+
+    With fingerprints, yield (key, value, fingerprint, raw JSON text of the value) where
+    the fingerprint is fingerprint_entry() of the raw text. known(key) may return the (text length, fingerprint) an entry had
+    in a previous dump; if the next that many characters still hash to it, the entry
+    is not decoded and UNCHANGED_ENTRY is yielded as its value.
+    """
+    with open(file_path, 'r') as file:
+        reader = _StreamingObjectReader(file, chunk_size)
+        reader.expect('{')
+        if reader.peek() == '}':
+            return
+        while True:
+            if reader.peek() != '"':
+                raise json.JSONDecodeError("Expecting property name enclosed in double quotes", reader.buf, reader.pos)
+            key = reader.decode_value()
+            reader.expect(':')
+            if fingerprints:
+                previous = known(key) if known is not None else None
+                text = reader.peek_text(previous[0]) if previous is not None else None
+                if text is not None and fingerprint_entry(None, text) == previous[1]:
+                    reader.pos += previous[0]
+                    value = UNCHANGED_ENTRY
+                    yield key, value, previous[1], text
+                else:
+                    value, text = reader.decode_value(with_text=True)
+                    yield key, value, fingerprint_entry(value, text), text
+                del text
+            else:
+                value = reader.decode_value()
+                yield key, value
+            # Release the raw entry before parsing the next one
+            del value
+            separator = reader.peek()
+            if separator == '}':
+                return
+            if separator != ',':
+                raise json.JSONDecodeError("Expecting ','", reader.buf, reader.pos)
+            reader.pos += 1
+
+
+STATUS_FAILED = 'FAILED'
+STATUS_PENDING = 'PENDING'
+STATUS_SUCCESS = 'SUCCESS'
+
+
+class IndexAnalysis:
+    """Compact per-index analysis record.
+
+    Only the scalar fields the reports need are kept; the raw action/step/info
+    sub-dicts of the explain entry are not referenced so they can be freed as
+    soon as the index has been classified.
+    """
+
+    __slots__ = ('index', 'policy', 'state', 'enabled', 'operation', 'status',
+                 'failure_reason', 'failure_class', 'breaker_type', 'pending_reason',
+                 'conditions', 'consumed_retries', 'last_retry', 'creation_date', 'size')
+
+    def __init__(self, index: str, policy: str, state: str, enabled: bool, operation: str,
+                 creation_date: Optional[int], size: str):
+        self.index = index
+        self.policy = policy
+        self.state = state
+        self.enabled = enabled
+        self.operation = operation
+        self.creation_date = creation_date
+        self.size = size
+        self.status = 'Unknown'
+        self.failure_reason = None
+        self.failure_class = None
+        self.breaker_type = None
+        self.pending_reason = None
+        self.conditions = None
+        self.consumed_retries = None
+        self.last_retry = 0
+
+    def to_fields(self) -> Tuple:
+        """All fields in __slots__ order, as a marshallable tuple"""
+        return (self.index, self.policy, self.state, self.enabled, self.operation, self.status,
+                self.failure_reason, self.failure_class, self.breaker_type, self.pending_reason,
+                self.conditions, self.consumed_retries, self.last_retry, self.creation_date, self.size)
+
+    @classmethod
+    def from_fields(cls, fields: Tuple) -> 'IndexAnalysis':
+        """Rebuild an analysis from to_fields() without re-running __init__"""
+        analysis = cls.__new__(cls)
+        (analysis.index, analysis.policy, analysis.state, analysis.enabled, analysis.operation, analysis.status,
+         analysis.failure_reason, analysis.failure_class, analysis.breaker_type, analysis.pending_reason,
+         analysis.conditions, analysis.consumed_retries, analysis.last_retry, analysis.creation_date,
+         analysis.size) = fields
+        return analysis
+
+    @property
+    def issue(self) -> str:
+        """Failure or pending reason shown in the status table"""
+        if self.failure_reason is not None:
+            return self.failure_reason
+        if self.pending_reason is not None:
+            return self.pending_reason
+        return 'None'
+
+
+FAILURE_CIRCUIT_BREAKER = 'circuit_breaker'
+FAILURE_TIMEOUT = 'timeout'
+FAILURE_ERROR = 'error'
+FAILURE_UNKNOWN = 'unknown'
+
+# Patterns for the pieces of an OpenSearch/Elasticsearch circuit breaker failure, e.g.
+#   CircuitBreakingException[[parent] Data too large, data for [<http_request>] would be
+#   [31231231231/29gb], which is larger than the limit of [31111669350/28.9gb],
+#   real usage: [31231231000/29gb], new bytes reserved: [231/231b]]
+# They are combined into a single alternation so every string is scanned only once.
+FAILURE_PATTERNS = [
+    r'(?P<exception_class>[\w.]*CircuitBreakingException|circuit_breaking_exception)',
+    r'(?:\[(?P<breaker_type>[\w.-]+)\] )?(?P<data_too_large>Data too large)',
+    r'would be \[(?P<would_be_bytes>\d+)/(?P<would_be>[^\]]+)\]',
+    r'larger than the limit of \[(?P<limit_bytes>\d+)/(?P<limit>[^\]]+)\]',
+    r'real usage: \[(?P<real_usage_bytes>\d+)/(?P<real_usage>[^\]]+)\]',
+]
+FAILURE_REGEX = re.compile('|'.join(f'(?:{pattern})' for pattern in FAILURE_PATTERNS))
+
+
+class FailureDetails:
+    """Structured fields extracted from a single shard failure"""
+
+    __slots__ = ('exception_class', 'data_too_large', 'breaker_type', 'would_be_bytes', 'would_be',
+                 'limit_bytes', 'limit', 'real_usage_bytes', 'real_usage')
+
+    def __init__(self):
+        for field in self.__slots__:
+            setattr(self, field, None)
+
+    @property
+    def is_circuit_breaker(self) -> bool:
+        return self.exception_class is not None or self.data_too_large is not None
+
+    def describe(self) -> str:
+        """Human readable failure reason used in reports"""
+        if self.data_too_large is None:
+            return "Circuit Breaker - Data too large"
+        usage_info = []
+        if self.would_be is not None:
+            usage_info.append(f"Would use: {self.would_be_bytes}/{self.would_be}")
+        if self.limit is not None:
+            usage_info.append(f"Limit: {self.limit_bytes}/{self.limit}")
+        if self.real_usage is not None:
+            usage_info.append(f"Current: {self.real_usage_bytes}/{self.real_usage}")
+        return f"Circuit Breaker - Memory limit exceeded. {', '.join(usage_info)}"
+
+
+def _iter_strings(value: Any) -> Iterator[str]:
+    """Yield every string (dict keys excluded) nested in value, in document order"""
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            yield item
+        elif isinstance(item, dict):
+            stack.extend(reversed(list(item.values())))
+        elif isinstance(item, list):
+            stack.extend(reversed(item))
+
+
+def parse_failure(failure: Any) -> FailureDetails:
+    """Extract circuit breaker fields from a shard failure (string or nested dict/list)"""
+    details = FailureDetails()
+    for text in _iter_strings(failure):
+        for match in FAILURE_REGEX.finditer(text):
+            for field, value in match.groupdict().items():
+                # The first occurrence of each field wins
+                if value is not None and getattr(details, field) is None:
+                    setattr(details, field, value)
+    for field in ('would_be_bytes', 'limit_bytes', 'real_usage_bytes'):
+        value = getattr(details, field)
+        if value is not None:
+            setattr(details, field, int(value))
+    return details
+
+
+SIZE_UNITS = {'b': 1, 'kb': 1024, 'mb': 1024 ** 2, 'gb': 1024 ** 3, 'tb': 1024 ** 4, 'pb': 1024 ** 5}
+SIZE_REGEX = re.compile(r'^\s*([0-9]*\.?[0-9]+)\s*([kmgtp]?b)?\s*$', re.IGNORECASE)
+AGE_UNITS_DAYS = {'d': 1, 'h': 1 / 24, 'm': 1 / 1440, 's': 1 / 86400, 'ms': 1 / 86400000}
+AGE_REGEX = re.compile(r'^\s*([0-9]*\.?[0-9]+)\s*(ms|[dhms])?\s*$', re.IGNORECASE)
+
+
+def parse_size_to_bytes(size_str: Optional[str]) -> Optional[int]:
+    """Parse a _cat size such as '480gb', '1.5tb' or '1234' (plain bytes) into bytes"""
+    if not size_str:
+        return None
+    match = SIZE_REGEX.match(size_str)
+    if not match:
+        return None
+    number, unit = match.groups()
+    return int(float(number) * SIZE_UNITS[(unit or 'b').lower()])
+
+
+class IndexSizeTable:
+    """Read-only, memory-mapped view of a whitespace separated _cat/indices file.
+
+    Instead of a dict of every index name, only a sorted array of 64-bit keys
+    (24-bit hash of the index name << 40 | line offset) is kept in memory. A lookup
+    binary-searches the array and decodes the matching line from the mapping,
+    so sizes are only parsed for indices that are actually looked up.
+    """
+
+    OFFSET_BITS = 40
+    OFFSET_MASK = (1 << OFFSET_BITS) - 1
+
+    @staticmethod
+    def _name_hash(name: bytes) -> int:
+        # Hash collisions are resolved by comparing the name on the mapped line
+        return zlib.crc32(name) >> 8
+
+    def __init__(self, path: str):
+        self.path = path
+        self._map = None
+        self._open()
+        self.index_col, self.size_col, first_line_end = self._parse_header()
+        self._keys = self._build_keys(first_line_end)
+
+    def _open(self):
+        with open(self.path, 'rb') as f:
+            # mmap keeps its own handle, so the file can be closed right away
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _line_end(self, start: int) -> int:
+        end = self._map.find(b'\n', start)
+        return len(self._map) if end == -1 else end
+
+    def _parse_header(self) -> Tuple[int, int, int]:
+        end = self._line_end(0)
+        header = self._map[0:end].decode('utf-8', 'replace').split()
+        index_col = None
+        size_col = None
+        for i, h in enumerate(header):
+            if h.lower() == 'index':
+                index_col = i
+            elif h.lower().replace(' ', '') == 'store.size':
+                size_col = i
+        if index_col is None or size_col is None:
+            raise Exception('CSV header missing required columns')
+        return index_col, size_col, end
+
+    def _build_keys(self, header_end: int) -> array:
+        keys = array('Q')
+        min_parts = max(self.index_col, self.size_col) + 1
+        pos = header_end + 1
+        size = len(self._map)
+        while pos < size:
+            end = self._line_end(pos)
+            parts = self._map[pos:end].split()
+            if len(parts) >= min_parts:
+                keys.append((self._name_hash(parts[self.index_col]) << self.OFFSET_BITS) | pos)
+            pos = end + 1
+        return array('Q', sorted(keys))
+
+    def _split_line(self, offset: int) -> List[bytes]:
+        return self._map[offset:self._line_end(offset)].split()
+
+    def get(self, index_name: str, default: Optional[str] = None) -> Optional[str]:
+        """Return the raw store.size string for an index (e.g. '480gb')"""
+        name = index_name.encode('utf-8')
+        name_hash = self._name_hash(name)
+        found = default
+        i = bisect_left(self._keys, name_hash << self.OFFSET_BITS)
+        while i < len(self._keys) and self._keys[i] >> self.OFFSET_BITS == name_hash:
+            parts = self._split_line(self._keys[i] & self.OFFSET_MASK)
+            # Keep the last match so duplicate lines behave like the old dict loader
+            if parts[self.index_col] == name:
+                found = parts[self.size_col].decode('utf-8', 'replace')
+            i += 1
+        return found
+
+    def __contains__(self, index_name: str) -> bool:
+        return self.get(index_name) is not None
+
+    def __getitem__(self, index_name: str) -> str:
+        size = self.get(index_name)
+        if size is None:
+            raise KeyError(index_name)
+        return size
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def __getstate__(self):
+        # Worker processes re-map the file instead of receiving its contents
+        return {'path': self.path, 'index_col': self.index_col, 'size_col': self.size_col,
+                'keys': self._keys}
+
+    def __setstate__(self, state):
+        self.path = state['path']
+        self.index_col = state['index_col']
+        self.size_col = state['size_col']
+        self._keys = state['keys']
+        self._open()
+
+
+class IndexColumns:
+    """Array-backed size (bytes) and age (days) columns over the analyzed indices.
+
+    Sizes and ages are normalized once when the columns are built. Rows follow the
+    report order (failed, pending, successful), so each status is a contiguous row
+    range and the top-K queries only heap over the rows of that status.
+    """
+
+    UNKNOWN_SIZE = -1
+
+    def __init__(self, failed: List['IndexAnalysis'], pending: List['IndexAnalysis'],
+                 successful: List['IndexAnalysis'], now_ms: Optional[float] = None):
+        if now_ms is None:
+            now_ms = datetime.now(timezone.utc).timestamp() * 1000
+        self.records = list(chain(failed, pending, successful))
+        self.failed_rows = range(0, len(failed))
+        self.pending_rows = range(len(failed), len(failed) + len(pending))
+        self.size_bytes = array('q')
+        self.age_days = array('d')
+        for idx in self.records:
+            size = parse_size_to_bytes(idx.size)
+            self.size_bytes.append(self.UNKNOWN_SIZE if size is None else size)
+            created = idx.creation_date
+            self.age_days.append((now_ms - created) / 86400000 if isinstance(created, (int, float)) and created
+                                 else math.nan)
+
+    def size_at(self, row: int) -> Optional[int]:
+        size = self.size_bytes[row]
+        return None if size == self.UNKNOWN_SIZE else size
+
+    def age_at(self, row: int) -> Optional[float]:
+        age = self.age_days[row]
+        return None if math.isnan(age) else age
+
+    def age_display(self, row: int) -> str:
+        """Whole days since creation as shown in the report table (Unknown without a creation date)"""
+        age = self.age_at(row)
+        return "Unknown" if age is None else str(math.floor(age))
+
+    def largest_failed(self, n: int = TOP_OFFENDERS) -> List[Tuple['IndexAnalysis', int]]:
+        """Return the n largest failed indices with their size in bytes"""
+        rows = heapq.nlargest(n, (row for row in self.failed_rows if self.size_bytes[row] != self.UNKNOWN_SIZE),
+                              key=self.size_bytes.__getitem__)
+        return [(self.records[row], self.size_bytes[row]) for row in rows]
+
+    def oldest_pending_rollovers(self, n: int = TOP_OFFENDERS) -> List[Tuple['IndexAnalysis', float]]:
+        """Return the n oldest indices waiting on a rollover with their age in days"""
+        rows = heapq.nlargest(n, (row for row in self.pending_rows
+                                  if self.records[row].operation == 'rollover' and not math.isnan(self.age_days[row])),
+                              key=self.age_days.__getitem__)
+        return [(self.records[row], self.age_days[row]) for row in rows]
+
+    def size_histogram_by_policy(self) -> Dict[str, List[int]]:
+        """Count indices per policy in the SIZE_HISTOGRAM_LABELS buckets"""
+        histogram = {}
+        unknown_bucket = len(SIZE_HISTOGRAM_LABELS) - 1
+        for row, idx in enumerate(self.records):
+            counts = histogram.get(idx.policy)
+            if counts is None:
+                counts = histogram[idx.policy] = [0] * len(SIZE_HISTOGRAM_LABELS)
+            size = self.size_bytes[row]
+            counts[unknown_bucket if size == self.UNKNOWN_SIZE else bisect_right(SIZE_HISTOGRAM_BOUNDS, size)] += 1
+        return histogram
+
+
+class CompiledConditions:
+    """Rollover/transition thresholds of one policy, parsed once per distinct condition set.
+
+    As in ISM, the operation fires as soon as any condition is met. Thresholds are
+    normalized to days (min_index_age) and GB (min_size); `problem` is set when the
+    conditions can never be evaluated.
+    """
+
+    __slots__ = ('policy', 'min_age_days', 'min_size_gb', 'problem')
+
+    def __init__(self, policy: str, min_age_days: Optional[float], min_size_gb: Optional[float],
+                 problem: Optional[str] = None):
+        self.policy = policy
+        self.min_age_days = min_age_days
+        self.min_size_gb = min_size_gb
+        self.problem = problem
+
+    def evaluate(self, age_days: Optional[float], size_gb: Optional[float]
+                 ) -> Tuple[Optional[float], Optional[str], Optional[str]]:
+        """Return (days until the first condition fires, triggering condition, stuck reason)"""
+        if self.problem is not None:
+            return None, None, self.problem
+        candidates = []
+        if self.min_age_days is not None and age_days is not None:
+            candidates.append((max(0.0, self.min_age_days - age_days), 'min_index_age'))
+        if self.min_size_gb is not None and size_gb is not None:
+            if size_gb >= self.min_size_gb:
+                candidates.append((0.0, 'min_size'))
+            elif age_days and size_gb > 0:
+                # Assume the index keeps growing at its average rate since creation
+                candidates.append(((self.min_size_gb - size_gb) * age_days / size_gb, 'min_size'))
+            elif self.min_age_days is None and size_gb == 0 and age_days and age_days >= 1:
+                return None, None, f"Only min_size {self.min_size_gb:g}gb is set but the index holds no data"
+        if not candidates:
+            return None, None, None
+        eta, trigger = min(candidates)
+        if eta == 0:
+            return eta, trigger, f"{trigger} is already met but the index is still waiting"
+        return eta, trigger, None
+
+
+def format_eta(days: float) -> str:
+    """Human readable time until a forecast operation fires"""
+    if days <= 0:
+        return "now"
+    if days < 1:
+        return f"{days * 24:.1f}h"
+    return f"{days:.1f}d"
+
+
+def fingerprint_entry(index_data: Dict, raw_text: Optional[str] = None) -> bytes:
+    """Digest of the explain fields that determine how an index is classified.
+
+    Besides policy_id, state, action and step this covers 'enabled' and the whole
+    info object (message, conditions and the shard_failures that failures are
+    classified from), since those are copied into the report as well. When the
+    entry's raw JSON text is at hand (files are always streamed with --snapshot),
+    the text itself is hashed: it covers every field and is much cheaper than
+    repr() of the parsed entry, which is only used for --cluster pages.
+    """
+    if raw_text is None:
+        raw_text = repr((index_data.get('policy_id'), index_data.get('enabled', True), index_data.get('state'),
+                         index_data.get('action'), index_data.get('step'), index_data.get('info')))
+    return hashlib.blake2b(raw_text.encode('utf-8'), digest_size=16).digest()
+
+
+class SnapshotStore:
+    """SQLite-backed record of every index's fingerprint and classification from the previous run.
+
+    The previous snapshot is read into memory in one scan when the store is opened.
+    commit() writes only the rows of re-classified, new and removed indices, in one
+    transaction, so an interrupted run leaves the previous snapshot intact.
+
+    Each row keeps the fingerprint, the length of the entry's raw text (streaming only,
+    see iter_explain_entries) and the marshalled record, which is unpacked only when
+    the index is restored.
+    """
+
+    def __init__(self, path: str):
+        import sqlite3
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        with self.conn:
+            if self.conn.execute('PRAGMA user_version').fetchone()[0] != SNAPSHOT_FORMAT:
+                # Missing or written by an earlier version; this run starts a new baseline
+                self.conn.execute('DROP TABLE IF EXISTS snapshot')
+                self.conn.execute('DROP TABLE IF EXISTS snapshot_next')
+                self.conn.execute(f'PRAGMA user_version = {SNAPSHOT_FORMAT}')
+            self.conn.execute('CREATE TABLE IF NOT EXISTS snapshot (index_name TEXT PRIMARY KEY, fingerprint BLOB, '
+                              'text_length INTEGER, record BLOB)')
+        rows = self.conn.execute('SELECT index_name, fingerprint, text_length, record FROM snapshot')
+        self.previous = {row[0]: row[1:] for row in rows}
+        self.has_baseline = bool(self.previous)
+        self.start_run()
+
+    def start_run(self):
+        """Forget what an earlier, unfinished pass recorded"""
+        self._changed = {}
+        self._seen = set()
+
+    def lookup(self, index_name: str) -> Optional[Tuple]:
+        """Return (fingerprint, text length, packed record) from the previous run, or None"""
+        return self.previous.get(index_name)
+
+    def known_text(self, index_name: str) -> Optional[Tuple[int, bytes]]:
+        """Return (raw text length, fingerprint) of a streamed entry in the previous run, or None"""
+        row = self.previous.get(index_name)
+        if row is None or row[1] is None:
+            return None
+        return row[1], row[0]
+
+    @staticmethod
+    def record_fields(analysis: 'IndexAnalysis', index_field: Any, size_fallback: Any) -> Tuple:
+        return (analysis.status, analysis.failure_reason, analysis.failure_class, analysis.breaker_type,
+                analysis.pending_reason, analysis.conditions, analysis.consumed_retries, analysis.last_retry,
+                analysis.policy, analysis.state, analysis.enabled, analysis.operation, analysis.creation_date,
+                index_field, size_fallback)
+
+    def pack(self, analysis: 'IndexAnalysis', index_field: Any, size_fallback: Any) -> bytes:
+        return marshal.dumps(self.record_fields(analysis, index_field, size_fallback))
+
+    def unpack(self, record: bytes) -> Tuple:
+        """(status, failure_reason, ..., last_retry, policy, state, enabled, operation, creation_date,
+        index_field, size_fallback) of a packed record"""
+        return marshal.loads(record)
+
+    def keep(self, index_name: str):
+        """Carry an unchanged index over into the new snapshot"""
+        self._seen.add(index_name)
+
+    def record(self, fingerprint: bytes, analysis: 'IndexAnalysis', text_length: Optional[int] = None,
+               index_field: Any = None, size_fallback: Any = None):
+        self._seen.add(analysis.index)
+        self._changed[analysis.index] = (fingerprint, text_length, self.pack(analysis, index_field, size_fallback))
+
+    def commit(self):
+        """Make this run's snapshot the previous one, writing only what changed"""
+        removed = [index_name for index_name in self.previous if index_name not in self._seen]
+        self._write(removed)
+        for index_name in removed:
+            del self.previous[index_name]
+        self.previous.update(self._changed)
+        self.has_baseline = True
+        self.start_run()
+
+    def _write(self, removed: List[str]):
+        with self.conn:
+            self.conn.executemany('INSERT OR REPLACE INTO snapshot VALUES (?, ?, ?, ?)',
+                                  ((index_name,) + row for index_name, row in self._changed.items()))
+            self.conn.executemany('DELETE FROM snapshot WHERE index_name = ?', ((name,) for name in removed))
+
+    @property
+    def display_name(self) -> str:
+        """Snapshot name shown in the delta report"""
+        return os.path.basename(self.path)
+
+    def close(self):
+        self.conn.close()
+
+
+class MemorySnapshotStore(SnapshotStore):
+    """Snapshot of the previous pass kept only in memory (--watch without --snapshot).
+
+    The previous pass's {index: (fingerprint, text length, record)} map lives in the
+    process, with records stored as plain tuples, so nothing is written or unpacked.
+    """
+
+    def __init__(self):
+        self.path = None
+        self.previous = {}
+        self.has_baseline = False
+        self.start_run()
+
+    def pack(self, analysis: 'IndexAnalysis', index_field: Any, size_fallback: Any) -> Tuple:
+        return self.record_fields(analysis, index_field, size_fallback)
+
+    def unpack(self, record: Tuple) -> Tuple:
+        return record
+
+    def _write(self, removed: List[str]):
+        pass
+
+    @property
+    def display_name(self) -> str:
+        return "(in memory, previous dump)"
+
+    def close(self):
+        pass
+
+
+def write_lines(lines: Iterable[str], sink) -> int:
+    """Write lines separated by newlines (same text as "\\n".join) to a text sink; return the line count"""
+    count = 0
+    for line in lines:
+        if count:
+            sink.write("\n")
+        sink.write(line)
+        count += 1
+    return count
+
+
+class RunMetrics:
+    """Per-phase timers, counters and optional profiles of one analyzer run (--metrics, --profile).
+
+    Phases nest (generate_report analyzes on first use), so each phase records both
+    its inclusive wall time and its self time excluding nested phases.
+    """
+
+    def __init__(self, profile: bool = False):
+        self.profile = profile
+        self.phases = {}
+        self.counters = {}
+        self.failures_by_class = {}
+        self._stack = []
+        self._started = time.perf_counter()
+        self._profiler = None
+        self._tracemalloc = None
+        self._profile_stats = None
+        self._top_allocations = None
+
+    @contextmanager
+    def phase(self, name: str):
+        tracemalloc = self._tracemalloc
+        if tracemalloc is not None and tracemalloc.is_tracing():
+            if self._stack:
+                self._stack[-1]['peak'] = max(self._stack[-1]['peak'], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        frame = {'start': time.perf_counter(), 'nested': 0.0, 'peak': 0}
+        self._stack.append(frame)
         try:
-            # creation_ts is in ms, convert to seconds
-            creation_dt = datetime.fromtimestamp(creation_ts / 1000, tz=timezone.utc)
-            now_dt = datetime.now(timezone.utc)
-            age_days = (now_dt - creation_dt).days
-            return str(age_days)
-        except Exception:
-            return "Unknown"
-    def __init__(self, file_path: str, index_size_csv: str = None):
+            yield
+        finally:
+            self._stack.pop()
+            elapsed = time.perf_counter() - frame['start']
+            entry = self.phases.setdefault(name, {'calls': 0, 'seconds': 0.0, 'self_seconds': 0.0})
+            entry['calls'] += 1
+            entry['seconds'] += elapsed
+            entry['self_seconds'] += elapsed - frame['nested']
+            if self._stack:
+                self._stack[-1]['nested'] += elapsed
+            if tracemalloc is not None and tracemalloc.is_tracing():
+                peak = max(frame['peak'], tracemalloc.get_traced_memory()[1])
+                entry['peak_traced_bytes'] = max(entry.get('peak_traced_bytes', 0), peak)
+                if self._stack:
+                    self._stack[-1]['peak'] = max(self._stack[-1]['peak'], peak)
+
+    def record_analysis(self, results: Dict, failed: List['IndexAnalysis']):
+        self.counters = {
+            'total_indices': results['total_indices'],
+            'analyzed_indices': results['analyzed_indices'],
+            'skipped_indices': results['skipped_indices'],
+            **results['summary']
+        }
+        self.failures_by_class = dict(sorted(Counter(idx.failure_class for idx in failed).items()))
+
+    def start_profiling(self):
+        """Start cProfile and tracemalloc for the rest of the run"""
+        import cProfile
+        import tracemalloc
+        self.profile = True
+        self._tracemalloc = tracemalloc
+        tracemalloc.start()
+        self._profiler = cProfile.Profile()
+        self._profiler.enable()
+
+    def stop_profiling(self, stats_file: Optional[str] = None, top: int = 20):
+        """Stop profiling, optionally dump raw cProfile stats and keep the top entries for to_dict()"""
+        if self._profiler is None:
+            return
+        import pstats
+        self._profiler.disable()
+        snapshot = self._tracemalloc.take_snapshot()
+        self._tracemalloc.stop()
+        if stats_file:
+            self._profiler.dump_stats(stats_file)
+        stats = pstats.Stats(self._profiler)
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:top]
+        self._profile_stats = [
+            {'function': f"{filename}:{line}({func})", 'calls': calls, 'total_seconds': round(total, 6),
+             'cumulative_seconds': round(cumulative, 6)}
+            for (filename, line, func), (_, calls, total, cumulative, _) in rows
+        ]
+        self._top_allocations = [
+            {'location': str(stat.traceback), 'bytes': stat.size, 'blocks': stat.count}
+            for stat in snapshot.statistics('lineno')[:top]
+        ]
+        self._profiler = None
+
+    def to_dict(self, source: Optional[str] = None) -> Dict:
+        metrics = {
+            'source': source,
+            'generated_at': datetime.now(timezone.utc).isoformat(),
+            'wall_seconds': round(time.perf_counter() - self._started, 6),
+            'phases': {name: {key: round(value, 6) if isinstance(value, float) else value
+                              for key, value in entry.items()}
+                       for name, entry in self.phases.items()},
+            'counters': self.counters,
+            'failures_by_class': self.failures_by_class,
+        }
+        if self._profile_stats is not None:
+            metrics['profile'] = {'top_cumulative': self._profile_stats, 'top_allocations': self._top_allocations}
+        return metrics
+
+    def write(self, output_file: str, source: Optional[str] = None):
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(source), f, indent=2)
+            f.write("\n")
+
+
+def timed_phase(name: str):
+    """Method decorator that accounts the call to the analyzer's RunMetrics phase `name`"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.metrics.phase(name):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class ClusterFetchError(Exception):
+    """Raised when the explain API of a live cluster cannot be fetched"""
+
+
+class ClusterExplainSource:
+    """Pulls _plugins/_ism/explain from a live cluster page by page.
+
+    Pages (from/size) are requested concurrently over a pool of keep-alive
+    connections and yielded in page order, so classification starts with the
+    first page and at most two pages per fetch thread are held in memory.
+    Optional index patterns shard the requests as /_plugins/_ism/explain/<pattern>.
+    """
+
+    EXPLAIN_PATH = '/_plugins/_ism/explain'
+
+    def __init__(self, url: str, page_size: int = 500, concurrency: int = 4,
+                 index_patterns: Optional[List[str]] = None, auth: Optional[str] = None,
+                 verify_tls: bool = True, timeout: float = 60.0):
+        import base64
+        import queue
+        import urllib.parse
+        parsed = urllib.parse.urlsplit(url)
+        if parsed.scheme not in ('http', 'https') or not parsed.hostname:
+            raise ValueError(f"Invalid cluster URL: {url}")
+        self.url = url.rstrip('/')
+        self.scheme = parsed.scheme
+        self.host = parsed.hostname
+        self.port = parsed.port
+        self.base_path = parsed.path.rstrip('/')
+        self.page_size = page_size
+        self.concurrency = concurrency
+        self.index_patterns = index_patterns or [None]
+        self.timeout = timeout
+        self.headers = {'Accept': 'application/json', 'Connection': 'keep-alive'}
+        if auth:
+            self.headers['Authorization'] = 'Basic ' + base64.b64encode(auth.encode('utf-8')).decode('ascii')
+        self.ssl_context = None
+        if self.scheme == 'https':
+            import ssl
+            self.ssl_context = ssl.create_default_context()
+            if not verify_tls:
+                self.ssl_context.check_hostname = False
+                self.ssl_context.verify_mode = ssl.CERT_NONE
+        # Idle keep-alive connections shared by the fetch threads
+        self._connections = queue.LifoQueue()
+
+    def _new_connection(self) -> 'http.client.HTTPConnection':
+        import http.client
+        if self.scheme == 'https':
+            return http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout, context=self.ssl_context)
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def _page_path(self, pattern: Optional[str], offset: int) -> str:
+        import urllib.parse
+        path = self.base_path + self.EXPLAIN_PATH
+        if pattern:
+            path += '/' + urllib.parse.quote(pattern, safe='*,')
+        return f"{path}?{urllib.parse.urlencode({'from': offset, 'size': self.page_size})}"
+
+    def get_json(self, path: str) -> Dict:
+        """GET a path on a pooled connection and decode the JSON body"""
+        import http.client
+        import queue
+        try:
+            conn = self._connections.get_nowait()
+        except queue.Empty:
+            conn = self._new_connection()
+        for attempt in range(2):
+            try:
+                conn.request('GET', path, headers=self.headers)
+                response = conn.getresponse()
+                body = response.read()
+                break
+            except (http.client.HTTPException, OSError) as e:
+                conn.close()
+                # A pooled connection may have been closed by the server; retry once on a fresh one
+                if attempt == 1:
+                    raise ClusterFetchError(f"GET {self.url}{path} failed: {e}")
+                conn = self._new_connection()
+        if response.status != 200:
+            conn.close()
+            raise ClusterFetchError(f"GET {self.url}{path} returned HTTP {response.status}: "
+                                    f"{body[:200].decode('utf-8', 'replace')}")
+        self._connections.put(conn)
+        try:
+            return json.loads(body)
+        except json.JSONDecodeError as e:
+            raise ClusterFetchError(f"GET {self.url}{path} returned invalid JSON: {e}")
+
+    @staticmethod
+    def _page_entries(page: Dict) -> Iterator[Tuple[str, Any]]:
+        for key, value in page.items():
+            if key != 'total_managed_indices':
+                yield key, value
+
+    def iter_entries(self) -> Iterator[Tuple[str, Any]]:
+        """Yield (key, value) pairs of the explain output, page by page"""
+        from concurrent.futures import ThreadPoolExecutor
+        total = 0
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            for pattern in self.index_patterns:
+                # The first page tells how many managed indices there are to page through
+                first_page = self.get_json(self._page_path(pattern, 0))
+                pattern_total = first_page.get('total_managed_indices', 0)
+                total += pattern_total
+                yield from self._page_entries(first_page)
+                del first_page
+                
+                in_flight = deque()
+                for offset in range(self.page_size, pattern_total, self.page_size):
+                    in_flight.append(pool.submit(self.get_json, self._page_path(pattern, offset)))
+                    if len(in_flight) >= self.concurrency * 2:
+                        yield from self._page_entries(in_flight.popleft().result())
+                while in_flight:
+                    yield from self._page_entries(in_flight.popleft().result())
+        yield 'total_managed_indices', total
+
+    def close(self):
+        import queue
+        while True:
+            try:
+                self._connections.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+class ISMPolicyAnalyzer:
+    def __init__(self, file_path: str, index_size_csv: str = None, stream: bool = False,
+                 workers: int = 1, range_bytes: int = RANGE_BYTES, snapshot: Optional[SnapshotStore] = None,
+                 source: Optional[ClusterExplainSource] = None, metrics: Optional[RunMetrics] = None):
         self.file_path = file_path
+        self.metrics = metrics or RunMetrics()
+        # Snapshot runs always stream a file, so unchanged entries are matched by their raw text and not
+        # decoded; with --workers the worker processes parse the file, so it is not loaded here either
+        self.stream = stream or (source is None and (snapshot is not None or workers > 1))
+        self.source = source
+        self.workers = workers
+        self.range_bytes = range_bytes
+        self.snapshot = snapshot
+        self.delta = None
+        self._snapshot_inflight = {}
         self.data = None
+        self.stream_ready = False
         self.failed_indices = []
         self.pending_indices = []
         self.successful_indices = []
+        self.analysis_results = None
         self.circuit_breaker_limit = 31111669350  # 28.9GB
+        self.compiled_conditions = {}
         self.index_sizes = {}
         if index_size_csv:
             self.index_sizes = self._load_index_sizes(index_size_csv)
 
+    @timed_phase('load_index_sizes')
     def _load_index_sizes(self, csv_path: str):
-        sizes = {}
+        """Open the _cat/indices file as a lazily parsed, memory-mapped size table"""
         try:
-            with open(csv_path, 'r') as f:
-                # Read header and split by whitespace
-                header_line = f.readline()
-                header = [h.strip() for h in header_line.split()]
-                index_col = None
-                size_col = None
-                for i, h in enumerate(header):
-                    if h.lower() == 'index':
-                        index_col = i
-                    elif h.lower().replace(' ', '') == 'store.size':
-                        size_col = i
-                if index_col is None or size_col is None:
-                    raise Exception('CSV header missing required columns')
-                # Read the rest of the lines
-                for line in f:
-                    parts = line.split()
-                    if len(parts) > max(index_col, size_col):
-                        idx = parts[index_col].strip()
-                        size = parts[size_col].strip()
-                        sizes[idx] = size
+            return IndexSizeTable(csv_path)
         except Exception as e:
             print(f"Warning: Could not load index sizes from {csv_path}: {e}")
-        return sizes
+            return {}
         
+    @timed_phase('load_data')
     def load_data(self) -> bool:
-        """Load JSON data from file"""
+        """Load JSON data from file (in streaming mode only check that it can be opened)"""
+        self.invalidate_analysis()
+        if self.source is not None:
+            # Pages are fetched from the cluster during analysis
+            self.stream_ready = True
+            return True
         try:
+            if self.stream:
+                # Entries are parsed lazily by iter_entries() during analysis
+                with open(self.file_path, 'r'):
+                    pass
+                self.stream_ready = True
+                return True
             with open(self.file_path, 'r') as file:
                 self.data = json.load(file)
             return True
@@ -93,6 +1049,107 @@ class ISMPolicyAnalyzer:
             print(f"❌ Error loading file: {e}")
             return False
     
+    def invalidate_analysis(self):
+        """Drop cached analysis results so the next call re-classifies all indices"""
+        self.analysis_results = None
+        self.failed_indices = []
+        self.pending_indices = []
+        self.successful_indices = []
+        self.delta = None
+        self._snapshot_inflight = {}
+        self.columns = None
+        self.forecast = None
+
+    def get_columns(self) -> IndexColumns:
+        """Size/age columns over the analyzed indices, built once per analysis pass"""
+        self.analyze_all_indices()
+        if self.columns is None:
+            self.columns = IndexColumns(self.failed_indices, self.pending_indices, self.successful_indices)
+        return self.columns
+
+    def compile_conditions(self, policy: str, conditions: Dict) -> CompiledConditions:
+        """Parse the thresholds of a policy's conditions once and cache the compiled predicate"""
+        key = (policy, tuple(sorted((name, str(details.get('condition'))) for name, details in conditions.items()
+                                    if isinstance(details, dict))))
+        compiled = self.compiled_conditions.get(key)
+        if compiled is not None:
+            return compiled
+        min_age_days = None
+        min_size_gb = None
+        problem = None
+        for name, threshold in key[1]:
+            # A zero threshold ('0s') is valid and fires at once; only unknown units are a problem
+            if name == 'min_index_age':
+                min_age_days = self.parse_age_condition(threshold)
+                if not AGE_REGEX.match(threshold):
+                    problem = f"min_index_age threshold '{threshold}' cannot be parsed"
+            elif name == 'min_size':
+                min_size_gb = self.parse_size_condition(threshold)
+                if not SIZE_REGEX.match(threshold):
+                    problem = f"min_size threshold '{threshold}' cannot be parsed"
+        compiled = self.compiled_conditions[key] = CompiledConditions(policy, min_age_days, min_size_gb, problem)
+        return compiled
+
+    def forecast_pending(self) -> Dict:
+        """Forecast when each pending index's conditions fire, in one pass over the pending rows.
+
+        Returns sorted (analysis, days, trigger) forecasts, (analysis, reason) pairs for
+        indices stuck behind conditions that cannot complete, the number of pending
+        indices without an estimate and the number of compiled condition sets.
+        """
+        if self.forecast is not None:
+            return self.forecast
+        columns = self.get_columns()
+        forecasts = []
+        stuck = []
+        unknown = 0
+        for row in columns.pending_rows:
+            idx = columns.records[row]
+            if not idx.conditions:
+                unknown += 1
+                continue
+            compiled = self.compile_conditions(idx.policy, idx.conditions)
+            age_days = columns.age_at(row)
+            age_current = idx.conditions.get('min_index_age', {}).get('current')
+            if age_current is not None:
+                age_days = self.parse_age_condition(str(age_current))
+            size_bytes = columns.size_at(row)
+            size_gb = None if size_bytes is None else size_bytes / (1024 ** 3)
+            size_current = idx.conditions.get('min_size', {}).get('current')
+            if size_current is not None:
+                size_gb = self.parse_size_condition(str(size_current))
+            eta, trigger, reason = compiled.evaluate(age_days, size_gb)
+            if reason is not None:
+                stuck.append((idx, reason))
+            elif eta is None:
+                unknown += 1
+            else:
+                forecasts.append((idx, eta, trigger))
+        forecasts.sort(key=lambda item: item[1])
+        self.forecast = {'forecasts': forecasts, 'stuck': stuck, 'unknown': unknown,
+                         'compiled': len(self.compiled_conditions)}
+        return self.forecast
+
+    def has_data(self) -> bool:
+        """Check whether data is loaded (or ready to be streamed)"""
+        if self.stream or self.source is not None:
+            return self.stream_ready
+        return bool(self.data)
+
+    def source_name(self) -> str:
+        """Name of the analyzed input shown in reports"""
+        if self.source is not None:
+            return self.source.url
+        return os.path.basename(self.file_path)
+
+    def iter_entries(self) -> Iterator[Tuple[str, Any]]:
+        """Iterate over top-level (key, value) pairs of the explain output"""
+        if self.source is not None:
+            return self.source.iter_entries()
+        if self.stream:
+            return iter_explain_entries(self.file_path)
+        return iter(self.data.items())
+
     def convert_timestamp(self, timestamp: int) -> str:
         """Convert epoch timestamp to readable format"""
         try:
@@ -111,23 +1168,25 @@ class ISMPolicyAnalyzer:
             return 0.0
     
     def parse_size_condition(self, size_str: str) -> float:
-        """Parse size condition (e.g., '480gb' -> 480.0)"""
-        try:
-            if size_str.lower().endswith('gb'):
-                return float(size_str[:-2])
-            elif size_str.lower().endswith('mb'):
-                return float(size_str[:-2]) / 1024
-            else:
-                return float(size_str)
-        except:
+        """Parse size condition in GB (e.g., '480gb' -> 480.0, '1tb' -> 1024.0, plain numbers are GB)"""
+        match = SIZE_REGEX.match(size_str)
+        if not match:
             return 0.0
+        number, unit = match.groups()
+        if unit is None:
+            return float(number)
+        return float(number) * SIZE_UNITS[unit.lower()] / (1024 ** 3)
     
     def extract_index_size(self, index_data: Dict) -> str:
         """Get index size from loaded CSV sizes, fallback to ISM info if not found."""
         index_name = index_data.get('index', None)
-        if index_name and index_name in self.index_sizes:
-            return self.index_sizes[index_name]
-        # Fallback to ISM info
+        size = self.index_sizes.get(index_name) if index_name else None
+        if size is not None:
+            return size
+        return self._info_size(index_data)
+    
+    def _info_size(self, index_data: Dict) -> str:
+        """Fallback size from the ISM info of an entry"""
         try:
             info = index_data.get('info', {})
             if 'conditions' in info and 'min_size' in info['conditions']:
@@ -138,410 +1197,459 @@ class ISMPolicyAnalyzer:
             return "Unknown"
     
     def parse_age_condition(self, age_str: str) -> float:
-        """Parse age condition (e.g., '7d' -> 7.0, '1.8d' -> 1.8)"""
-        try:
-            if age_str.lower().endswith('d'):
-                return float(age_str[:-1])
-            elif age_str.lower().endswith('h'):
-                return float(age_str[:-1]) / 24
-            else:
-                return float(age_str)
-        except:
+        """Parse age condition in days (e.g., '7d' -> 7.0, '12h' -> 0.5, '30m', '90s', '500ms'; plain numbers are days)"""
+        match = AGE_REGEX.match(age_str)
+        if not match:
             return 0.0
+        number, unit = match.groups()
+        return float(number) * AGE_UNITS_DAYS[(unit or 'd').lower()]
     
-    def analyze_index(self, index_name: str, index_data: Dict) -> Dict:
-        """Analyze a single index and return its status"""
-        analysis = {
-            'index': index_name,
-            'policy': index_data.get('policy_id', 'Unknown'),
-            'state': index_data.get('state', {}).get('name', 'Unknown'),
-            'enabled': index_data.get('enabled', True),
-            'rolled_over': index_data.get('rolled_over', False),
-            'action': index_data.get('action', {}),
-            'step': index_data.get('step', {}),
-            'info': index_data.get('info', {}),
-            'creation_date': index_data.get('index_creation_date'),
-            'size': self.extract_index_size(index_data),
-            'status': 'Unknown',
-            'issues': [],
-            'recommendations': []
-        }
+    def analyze_index(self, index_name: str, index_data: Dict) -> IndexAnalysis:
+        """Analyze a single index, record it under its status and return the analysis"""
+        analysis = self.classify_index(index_name, index_data)
+        self._record_analysis(analysis)
+        return analysis
+    
+    def _record_analysis(self, analysis: IndexAnalysis):
+        """Append an analysis to the failed/pending/successful list matching its status"""
+        if analysis.status == STATUS_FAILED:
+            self.failed_indices.append(analysis)
+        elif analysis.status == STATUS_PENDING:
+            self.pending_indices.append(analysis)
+        else:
+            self.successful_indices.append(analysis)
+    
+    def _new_analysis(self, index_name: str, index_data: Dict) -> IndexAnalysis:
+        """Build an unclassified record from the cheap scalar fields of an explain entry"""
+        return IndexAnalysis(
+            index=index_name,
+            policy=index_data.get('policy_id', 'Unknown'),
+            state=index_data.get('state', {}).get('name', 'Unknown'),
+            enabled=index_data.get('enabled', True),
+            operation=index_data.get('action', {}).get('name', 'Unknown'),
+            creation_date=index_data.get('index_creation_date'),
+            size=self.extract_index_size(index_data)
+        )
+    
+    def classify_index(self, index_name: str, index_data: Dict) -> IndexAnalysis:
+        """Classify a single index without touching the analyzer's result lists"""
+        action = index_data.get('action', {})
+        step = index_data.get('step', {})
+        info = index_data.get('info', {})
         
-        action = analysis['action']
-        step = analysis['step']
-        info = analysis['info']
+        analysis = self._new_analysis(index_name, index_data)
         
         # Determine status based on action and step
         if action.get('failed', False):
-            analysis['status'] = 'FAILED'
-            analysis['failure_reason'] = self._extract_failure_reason(info, action)
-            analysis['consumed_retries'] = action.get('consumed_retries', 0)
-            analysis['last_retry'] = action.get('last_retry_time', 0)
-            self.failed_indices.append(analysis)
+            analysis.status = STATUS_FAILED
+            analysis.failure_reason, analysis.failure_class, analysis.breaker_type = self._classify_failure(info, action)
+            analysis.consumed_retries = action.get('consumed_retries', 0)
+            analysis.last_retry = action.get('last_retry_time', 0)
             
         elif step.get('step_status') == 'failed':
-            analysis['status'] = 'FAILED'
-            analysis['failure_reason'] = self._extract_failure_reason(info, step)
-            self.failed_indices.append(analysis)
+            analysis.status = STATUS_FAILED
+            analysis.failure_reason, analysis.failure_class, analysis.breaker_type = self._classify_failure(info, step)
             
         elif step.get('step_status') == 'timed_out':
-            analysis['status'] = 'FAILED'
-            analysis['failure_reason'] = 'Operation timed out'
-            self.failed_indices.append(analysis)
+            analysis.status = STATUS_FAILED
+            analysis.failure_reason = 'Operation timed out'
+            analysis.failure_class = FAILURE_TIMEOUT
             
         elif step.get('step_status') == 'condition_not_met':
-            analysis['status'] = 'PENDING'
-            analysis['pending_reason'] = info.get('message', 'Waiting for conditions')
+            analysis.status = STATUS_PENDING
+            analysis.pending_reason = info.get('message', 'Waiting for conditions')
             if 'conditions' in info:
-                analysis['conditions'] = info['conditions']
-            self.pending_indices.append(analysis)
+                analysis.conditions = info['conditions']
             
         else:
-            analysis['status'] = 'SUCCESS'
-            self.successful_indices.append(analysis)
+            analysis.status = STATUS_SUCCESS
         
         return analysis
     
-    def _extract_failure_reason(self, info: Dict, action_or_step: Dict) -> str:
-        """Extract detailed failure reason from info and action/step data"""
+    def _classify_failure(self, info: Dict, action_or_step: Dict) -> Tuple[str, str, Optional[str]]:
+        """Return (failure reason, failure class, breaker type) from info and action/step data"""
         # Check for circuit breaking exceptions
-        if 'shard_failures' in info:
-            failures = info['shard_failures']
-            if failures and 'CircuitBreakingException' in str(failures[0]):
-                return self._parse_circuit_breaker_error(failures[0])
+        failures = info.get('shard_failures')
+        if failures:
+            details = parse_failure(failures[0])
+            if details.is_circuit_breaker:
+                return details.describe(), FAILURE_CIRCUIT_BREAKER, details.breaker_type
         
         # Check for timeout
         if action_or_step.get('step_status') == 'timed_out':
-            return 'Operation timed out'
+            return 'Operation timed out', FAILURE_TIMEOUT, None
         
         # Check for generic message
         if 'message' in info:
-            return info['message']
+            return info['message'], FAILURE_ERROR, None
         
-        return 'Unknown failure reason'
+        return 'Unknown failure reason', FAILURE_UNKNOWN, None
     
-    def _parse_circuit_breaker_error(self, error_msg: str) -> str:
-        """Parse circuit breaker error message"""
-        try:
-            if 'Data too large' in error_msg:
-                # Extract memory usage information
-                parts = error_msg.split(',')
-                usage_info = []
-                for part in parts:
-                    if 'would be' in part:
-                        usage = part.split('[')[1].split(']')[0]
-                        usage_info.append(f"Would use: {usage}")
-                    elif 'larger than the limit' in part:
-                        limit = part.split('[')[1].split(']')[0]
-                        usage_info.append(f"Limit: {limit}")
-                    elif 'real usage' in part:
-                        real = part.split('[')[1].split(']')[0]
-                        usage_info.append(f"Current: {real}")
-                
-                return f"Circuit Breaker - Memory limit exceeded. {', '.join(usage_info)}"
-        except:
-            pass
-        
-        return "Circuit Breaker - Data too large"
+    def _extract_failure_reason(self, info: Dict, action_or_step: Dict) -> str:
+        """Extract detailed failure reason from info and action/step data"""
+        return self._classify_failure(info, action_or_step)[0]
     
+    @timed_phase('generate_recommendations')
     def generate_recommendations(self, output_file: Optional[str] = None) -> str:
-        """Generate detailed recommendations file"""
-        if not self.data:
+        """Generate detailed recommendations file.
+
+        With output_file the document is streamed to the file and the path is
+        returned; otherwise the recommendations text is returned.
+        """
+        if not self.has_data():
             return "❌ No data loaded. Please load data first."
         
-        # Ensure we have analyzed data
-        if not hasattr(self, 'failed_indices') or not self.failed_indices:
-            self.analyze_all_indices()
-        
-        recommendations = []
-        recommendations.append("# ISM Policy Recommendations")
-        recommendations.append(f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        recommendations.append(f"**Source File:** {os.path.basename(self.file_path)}")
-        recommendations.append("")
+        # Ensure we have analyzed data (cached after the first pass)
+        self.analyze_all_indices()
+        return self._emit_document(self.iter_recommendation_lines(), output_file, 'recommendations')
+    
+    def _emit_document(self, lines: Iterator[str], output_file: Optional[str], label: str) -> str:
+        """Stream lines to output_file (returning its path), or join them when no file is given"""
+        if not output_file:
+            return "\n".join(lines)
+        try:
+            with open(output_file, 'w', buffering=REPORT_BUFFER_SIZE) as f:
+                write_lines(lines, f)
+            print(f"✅ {label.capitalize()} saved to: {output_file}")
+        except Exception as e:
+            print(f"❌ Error saving {label}: {e}")
+        return output_file
+    
+    def iter_recommendation_lines(self) -> Iterator[str]:
+        """Yield the recommendations Markdown document line by line"""
+        yield "# ISM Policy Recommendations"
+        yield f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+        yield f"**Source File:** {self.source_name()}"
+        yield ""
         
         # Executive summary of issues
-        recommendations.append("## Issue Summary")
-        recommendations.append("")
+        yield "## Issue Summary"
+        yield ""
         
         if self.failed_indices:
-            circuit_breaker_failures = [idx for idx in self.failed_indices if 'Circuit Breaker' in idx.get('failure_reason', '')]
-            timeout_failures = [idx for idx in self.failed_indices if 'timeout' in idx.get('failure_reason', '').lower()]
+            circuit_breaker_failures = [idx for idx in self.failed_indices if idx.failure_class == FAILURE_CIRCUIT_BREAKER]
+            timeout_failures = [idx for idx in self.failed_indices if 'timeout' in idx.failure_reason.lower()]
             
-            recommendations.append(f"**Total Failed Indices:** {len(self.failed_indices)}")
-            recommendations.append(f"**Circuit Breaker Failures:** {len(circuit_breaker_failures)}")
-            recommendations.append(f"**Timeout Failures:** {len(timeout_failures)}")
-            recommendations.append("")
+            yield f"**Total Failed Indices:** {len(self.failed_indices)}"
+            yield f"**Circuit Breaker Failures:** {len(circuit_breaker_failures)}"
+            yield f"**Timeout Failures:** {len(timeout_failures)}"
+            yield ""
             
             # Immediate Actions
-            recommendations.append("## 🚨 Immediate Actions Required")
-            recommendations.append("")
+            yield "## 🚨 Immediate Actions Required"
+            yield ""
             
             if circuit_breaker_failures:
-                recommendations.append("### Circuit Breaker Failures")
-                recommendations.append("**Priority: HIGH** - These indices cannot perform operations due to memory limits.")
-                recommendations.append("")
-                recommendations.append("#### 1. Increase Circuit Breaker Limits")
-                recommendations.append("```json")
-                recommendations.append("PUT /_cluster/settings")
-                recommendations.append("{")
-                recommendations.append("  \"persistent\": {")
-                recommendations.append("    \"indices.breaker.total.limit\": \"35gb\",")
-                recommendations.append("    \"indices.breaker.fielddata.limit\": \"20gb\",")
-                recommendations.append("    \"indices.breaker.request.limit\": \"15gb\"")
-                recommendations.append("  }")
-                recommendations.append("}")
-                recommendations.append("```")
-                recommendations.append("")
+                yield "### Circuit Breaker Failures"
+                yield "**Priority: HIGH** - These indices cannot perform operations due to memory limits."
+                yield ""
+                yield "#### 1. Increase Circuit Breaker Limits"
+                yield "```json"
+                yield "PUT /_cluster/settings"
+                yield "{"
+                yield "  \"persistent\": {"
+                yield "    \"indices.breaker.total.limit\": \"35gb\","
+                yield "    \"indices.breaker.fielddata.limit\": \"20gb\","
+                yield "    \"indices.breaker.request.limit\": \"15gb\""
+                yield "  }"
+                yield "}"
+                yield "```"
+                yield ""
                 
-                recommendations.append("#### 2. Clear Field Data Cache")
-                recommendations.append("```bash")
-                recommendations.append("# Clear fielddata cache to free memory immediately")
-                recommendations.append("POST /_cache/clear?fielddata=true")
-                recommendations.append("")
-                recommendations.append("# Clear all caches if needed")
-                recommendations.append("POST /_cache/clear")
-                recommendations.append("```")
-                recommendations.append("")
+                yield "#### 2. Clear Field Data Cache"
+                yield "```bash"
+                yield "# Clear fielddata cache to free memory immediately"
+                yield "POST /_cache/clear?fielddata=true"
+                yield ""
+                yield "# Clear all caches if needed"
+                yield "POST /_cache/clear"
+                yield "```"
+                yield ""
                 
-                recommendations.append("#### 3. Force Garbage Collection")
-                recommendations.append("```bash")
-                recommendations.append("POST /_nodes/gc")
-                recommendations.append("```")
-                recommendations.append("")
+                yield "#### 3. Force Garbage Collection"
+                yield "```bash"
+                yield "POST /_nodes/gc"
+                yield "```"
+                yield ""
             
             if timeout_failures:
-                recommendations.append("### Timeout Failures")
-                recommendations.append("**Priority: HIGH** - Operations are timing out.")
-                recommendations.append("")
-                recommendations.append("#### 1. Check Cluster Health")
-                recommendations.append("```bash")
-                recommendations.append("GET /_cluster/health")
-                recommendations.append("GET /_nodes/stats")
-                recommendations.append("GET /_cat/pending_tasks?v")
-                recommendations.append("```")
-                recommendations.append("")
+                yield "### Timeout Failures"
+                yield "**Priority: HIGH** - Operations are timing out."
+                yield ""
+                yield "#### 1. Check Cluster Health"
+                yield "```bash"
+                yield "GET /_cluster/health"
+                yield "GET /_nodes/stats"
+                yield "GET /_cat/pending_tasks?v"
+                yield "```"
+                yield ""
                 
-                recommendations.append("#### 2. Increase Operation Timeouts")
-                recommendations.append("Update your ISM policy to include longer timeouts:")
-                recommendations.append("```json")
-                recommendations.append("{")
-                recommendations.append("  \"policy\": {")
-                recommendations.append("    \"default_state\": \"hot\",")
-                recommendations.append("    \"states\": [{")
-                recommendations.append("      \"name\": \"warm\",")
-                recommendations.append("      \"actions\": [{")
-                recommendations.append("        \"warm_migration\": {")
-                recommendations.append("          \"timeout\": \"12h\"")
-                recommendations.append("        }")
-                recommendations.append("      }]")
-                recommendations.append("    }]")
-                recommendations.append("  }")
-                recommendations.append("}")
-                recommendations.append("```")
-                recommendations.append("")
+                yield "#### 2. Increase Operation Timeouts"
+                yield "Update your ISM policy to include longer timeouts:"
+                yield "```json"
+                yield "{"
+                yield "  \"policy\": {"
+                yield "    \"default_state\": \"hot\","
+                yield "    \"states\": [{"
+                yield "      \"name\": \"warm\","
+                yield "      \"actions\": [{"
+                yield "        \"warm_migration\": {"
+                yield "          \"timeout\": \"12h\""
+                yield "        }"
+                yield "      }]"
+                yield "    }]"
+                yield "  }"
+                yield "}"
+                yield "```"
+                yield ""
             
             # Re-enable disabled indices
-            disabled_indices = [idx for idx in self.failed_indices if not idx['enabled']]
+            disabled_indices = [idx for idx in self.failed_indices if not idx.enabled]
             if disabled_indices:
-                recommendations.append("### Re-enable Failed Indices")
-                recommendations.append("**Priority: HIGH** - After fixing root causes, re-enable these indices:")
-                recommendations.append("")
+                yield "### Re-enable Failed Indices"
+                yield "**Priority: HIGH** - After fixing root causes, re-enable these indices:"
+                yield ""
                 for idx in disabled_indices:
-                    recommendations.append(f"#### {idx['index']}")
-                    recommendations.append("```bash")
-                    recommendations.append(f"# Re-enable ISM policy for {idx['index']}")
-                    recommendations.append(f"POST /_plugins/_ism/change_policy/{idx['index']}")
-                    recommendations.append("{")
-                    recommendations.append(f"  \"policy_id\": \"{idx['policy']}\",")
-                    recommendations.append("  \"state\": \"hot\"")
-                    recommendations.append("}")
-                    recommendations.append("```")
-                    recommendations.append("")
+                    yield f"#### {idx.index}"
+                    yield "```bash"
+                    yield f"# Re-enable ISM policy for {idx.index}"
+                    yield f"POST /_plugins/_ism/change_policy/{idx.index}"
+                    yield "{"
+                    yield f"  \"policy_id\": \"{idx.policy}\","
+                    yield "  \"state\": \"hot\""
+                    yield "}"
+                    yield "```"
+                    yield ""
+        
+        # Pending indices whose conditions cannot complete on their own
+        stuck = self.forecast_pending()['stuck'] if self.pending_indices else []
+        if stuck:
+            yield "## 🧱 Indices Stuck Behind Unreachable Conditions"
+            yield ""
+            yield f"**{len(stuck)} pending indices** will not move on without intervention."
+            yield ""
+            for reason, count in Counter(reason for _, reason in stuck).most_common():
+                yield f"- {reason}: {count} indices"
+            yield ""
+            yield "**Actions:**"
+            yield "1. For conditions that are already met, check the rollover alias and write index of each index"
+            yield "2. Fix unparseable thresholds in the policy and re-apply it to the affected indices"
+            yield "3. Add a min_index_age condition to policies that only roll over on size"
+            yield ""
+        
+        # Rank the worst offenders from the precomputed size/age columns
+        if self.failed_indices or self.pending_indices:
+            columns = self.get_columns()
+            yield "## 🎯 Worst Offenders"
+            yield ""
+            
+            largest_failed = columns.largest_failed()
+            if largest_failed:
+                yield "### Largest Failed Indices"
+                yield "Fix these first - large indices hold the most data behind a stuck policy."
+                yield ""
+                yield "| Index | Policy | Size | Failure Reason |"
+                yield "|-------|--------|------|----------------|"
+                for idx, _ in largest_failed:
+                    yield f"| {idx.index} | {idx.policy} | {idx.size} | {idx.failure_reason} |"
+                yield ""
+            
+            oldest_pending = columns.oldest_pending_rollovers()
+            if oldest_pending:
+                yield "### Oldest Pending Rollovers"
+                yield "Indices that have waited longest for a rollover; check their conditions and aliases."
+                yield ""
+                yield "| Index | Policy | Age (days) | Size |"
+                yield "|-------|--------|------------|------|"
+                for idx, age in oldest_pending:
+                    yield f"| {idx.index} | {idx.policy} | {age:.1f} | {idx.size} |"
+                yield ""
+            
+            yield "### Index Size Distribution by Policy"
+            yield ""
+            yield "| Policy | " + " | ".join(SIZE_HISTOGRAM_LABELS) + " |"
+            yield "|--------|" + "|".join("-" * (len(label) + 2) for label in SIZE_HISTOGRAM_LABELS) + "|"
+            for policy, counts in sorted(columns.size_histogram_by_policy().items()):
+                yield f"| {policy} | " + " | ".join(str(count) for count in counts) + " |"
+            yield ""
         
         # Medium-term optimizations
-        recommendations.append("## 🔧 Medium-term Optimizations")
-        recommendations.append("")
-        
-        recommendations.append("### 1. Resource Scaling")
-        recommendations.append("**Timeline: 1-2 weeks**")
-        recommendations.append("")
-        recommendations.append("#### Increase Heap Size")
-        recommendations.append("- Current limit appears to be ~29GB")
-        recommendations.append("- Recommended: Increase to 50% of available RAM")
-        recommendations.append("- Update `jvm.options`: `-Xms32g -Xmx32g`")
-        recommendations.append("")
-        
-        recommendations.append("#### Add Data Nodes")
-        recommendations.append("- Distribute load across more nodes")
-        recommendations.append("- Reduce memory pressure per node")
-        recommendations.append("- Improve parallel processing capabilities")
-        recommendations.append("")
-        
-        recommendations.append("### 2. Index Optimization")
-        recommendations.append("**Timeline: 2-4 weeks**")
-        recommendations.append("")
-        recommendations.append("#### Optimize Rollover Thresholds")
-        recommendations.append("```json")
-        recommendations.append("PUT /_index_template/optimized_rollover")
-        recommendations.append("{")
-        recommendations.append("  \"index_patterns\": [\"otel-*\", \"*-logs-*\"],")
-        recommendations.append("  \"template\": {")
-        recommendations.append("    \"settings\": {")
-        recommendations.append("      \"index.plugins.index_state_management.rollover_alias\": \"active\",")
-        recommendations.append("      \"index.plugins.index_state_management.policy_id\": \"optimized_policy\"")
-        recommendations.append("    }")
-        recommendations.append("  }")
-        recommendations.append("}")
-        recommendations.append("```")
-        recommendations.append("")
-        
-        recommendations.append("#### Implement Force Merge Before Warm Transition")
-        recommendations.append("```json")
-        recommendations.append("{")
-        recommendations.append("  \"warm\": {")
-        recommendations.append("    \"actions\": [")
-        recommendations.append("      {")
-        recommendations.append("        \"force_merge\": {")
-        recommendations.append("          \"max_num_segments\": 1")
-        recommendations.append("        }")
-        recommendations.append("      },")
-        recommendations.append("      {")
-        recommendations.append("        \"warm_migration\": {}")
-        recommendations.append("      }")
-        recommendations.append("    ]")
-        recommendations.append("  }")
-        recommendations.append("}")
-        recommendations.append("```")
-        recommendations.append("")
+        yield "## 🔧 Medium-term Optimizations"
+        yield ""
+        
+        yield "### 1. Resource Scaling"
+        yield "**Timeline: 1-2 weeks**"
+        yield ""
+        yield "#### Increase Heap Size"
+        yield "- Current limit appears to be ~29GB"
+        yield "- Recommended: Increase to 50% of available RAM"
+        yield "- Update `jvm.options`: `-Xms32g -Xmx32g`"
+        yield ""
+        
+        yield "#### Add Data Nodes"
+        yield "- Distribute load across more nodes"
+        yield "- Reduce memory pressure per node"
+        yield "- Improve parallel processing capabilities"
+        yield ""
+        
+        yield "### 2. Index Optimization"
+        yield "**Timeline: 2-4 weeks**"
+        yield ""
+        yield "#### Optimize Rollover Thresholds"
+        yield "```json"
+        yield "PUT /_index_template/optimized_rollover"
+        yield "{"
+        yield "  \"index_patterns\": [\"otel-*\", \"*-logs-*\"],"
+        yield "  \"template\": {"
+        yield "    \"settings\": {"
+        yield "      \"index.plugins.index_state_management.rollover_alias\": \"active\","
+        yield "      \"index.plugins.index_state_management.policy_id\": \"optimized_policy\""
+        yield "    }"
+        yield "  }"
+        yield "}"
+        yield "```"
+        yield ""
+        
+        yield "#### Implement Force Merge Before Warm Transition"
+        yield "```json"
+        yield "{"
+        yield "  \"warm\": {"
+        yield "    \"actions\": ["
+        yield "      {"
+        yield "        \"force_merge\": {"
+        yield "          \"max_num_segments\": 1"
+        yield "        }"
+        yield "      },"
+        yield "      {"
+        yield "        \"warm_migration\": {}"
+        yield "      }"
+        yield "    ]"
+        yield "  }"
+        yield "}"
+        yield "```"
+        yield ""
         
         # Long-term strategy
-        recommendations.append("## 📈 Long-term Strategy")
-        recommendations.append("")
-        
-        recommendations.append("### 1. Architecture Improvements")
-        recommendations.append("**Timeline: 1-3 months**")
-        recommendations.append("")
-        recommendations.append("- **Hot-Warm-Cold Architecture**: Implement dedicated node types")
-        recommendations.append("- **Index Lifecycle Management**: Automate data tier transitions")
-        recommendations.append("- **Data Retention Policies**: Implement automated deletion of old data")
-        recommendations.append("- **Compression**: Enable index compression for warm/cold data")
-        recommendations.append("")
-        
-        recommendations.append("### 2. Monitoring and Alerting")
-        recommendations.append("**Timeline: 2-4 weeks**")
-        recommendations.append("")
-        recommendations.append("#### Set Up ISM Policy Monitoring")
-        recommendations.append("```json")
-        recommendations.append("PUT /_watcher/watch/ism_failures")
-        recommendations.append("{")
-        recommendations.append("  \"trigger\": {")
-        recommendations.append("    \"schedule\": {")
-        recommendations.append("      \"interval\": \"5m\"")
-        recommendations.append("    }")
-        recommendations.append("  },")
-        recommendations.append("  \"input\": {")
-        recommendations.append("    \"http\": {")
-        recommendations.append("      \"request\": {")
-        recommendations.append("        \"host\": \"localhost\",")
-        recommendations.append("        \"port\": 9200,")
-        recommendations.append("        \"path\": \"/_plugins/_ism/explain\"")
-        recommendations.append("      }")
-        recommendations.append("    }")
-        recommendations.append("  },")
-        recommendations.append("  \"condition\": {")
-        recommendations.append("    \"script\": {")
-        recommendations.append("      \"source\": \"return ctx.payload.total_managed_indices > 0\"")
-        recommendations.append("    }")
-        recommendations.append("  }")
-        recommendations.append("}")
-        recommendations.append("```")
-        recommendations.append("")
-        
-        recommendations.append("#### Circuit Breaker Monitoring")
-        recommendations.append("```bash")
-        recommendations.append("# Monitor circuit breaker usage")
-        recommendations.append("GET /_nodes/stats/breaker")
-        recommendations.append("")
-        recommendations.append("# Set up alerts for >80% usage")
-        recommendations.append("GET /_nodes/stats/breaker?filter_path=nodes.*.breakers.parent")
-        recommendations.append("```")
-        recommendations.append("")
-        
-        recommendations.append("### 3. Performance Optimization")
-        recommendations.append("**Timeline: Ongoing**")
-        recommendations.append("")
-        recommendations.append("- **Reduce Replica Count During Rollover**: Temporarily reduce replicas")
-        recommendations.append("- **Optimize Mapping**: Use appropriate field types and disable unnecessary features")
-        recommendations.append("- **Bulk Operations**: Optimize indexing performance")
-        recommendations.append("- **Refresh Intervals**: Increase refresh intervals for write-heavy indices")
-        recommendations.append("")
+        yield "## 📈 Long-term Strategy"
+        yield ""
+        
+        yield "### 1. Architecture Improvements"
+        yield "**Timeline: 1-3 months**"
+        yield ""
+        yield "- **Hot-Warm-Cold Architecture**: Implement dedicated node types"
+        yield "- **Index Lifecycle Management**: Automate data tier transitions"
+        yield "- **Data Retention Policies**: Implement automated deletion of old data"
+        yield "- **Compression**: Enable index compression for warm/cold data"
+        yield ""
+        
+        yield "### 2. Monitoring and Alerting"
+        yield "**Timeline: 2-4 weeks**"
+        yield ""
+        yield "#### Set Up ISM Policy Monitoring"
+        yield "```json"
+        yield "PUT /_watcher/watch/ism_failures"
+        yield "{"
+        yield "  \"trigger\": {"
+        yield "    \"schedule\": {"
+        yield "      \"interval\": \"5m\""
+        yield "    }"
+        yield "  },"
+        yield "  \"input\": {"
+        yield "    \"http\": {"
+        yield "      \"request\": {"
+        yield "        \"host\": \"localhost\","
+        yield "        \"port\": 9200,"
+        yield "        \"path\": \"/_plugins/_ism/explain\""
+        yield "      }"
+        yield "    }"
+        yield "  },"
+        yield "  \"condition\": {"
+        yield "    \"script\": {"
+        yield "      \"source\": \"return ctx.payload.total_managed_indices > 0\""
+        yield "    }"
+        yield "  }"
+        yield "}"
+        yield "```"
+        yield ""
+        
+        yield "#### Circuit Breaker Monitoring"
+        yield "```bash"
+        yield "# Monitor circuit breaker usage"
+        yield "GET /_nodes/stats/breaker"
+        yield ""
+        yield "# Set up alerts for >80% usage"
+        yield "GET /_nodes/stats/breaker?filter_path=nodes.*.breakers.parent"
+        yield "```"
+        yield ""
+        
+        yield "### 3. Performance Optimization"
+        yield "**Timeline: Ongoing**"
+        yield ""
+        yield "- **Reduce Replica Count During Rollover**: Temporarily reduce replicas"
+        yield "- **Optimize Mapping**: Use appropriate field types and disable unnecessary features"
+        yield "- **Bulk Operations**: Optimize indexing performance"
+        yield "- **Refresh Intervals**: Increase refresh intervals for write-heavy indices"
+        yield ""
         
         # Implementation timeline
-        recommendations.append("## 📅 Implementation Timeline")
-        recommendations.append("")
-        recommendations.append("| Priority | Action | Timeline | Impact |")
-        recommendations.append("|----------|--------|----------|--------|")
-        recommendations.append("| 🚨 Critical | Increase circuit breaker limits | Immediate | High |")
-        recommendations.append("| 🚨 Critical | Clear fielddata cache | Immediate | High |")
-        recommendations.append("| 🚨 Critical | Re-enable failed indices | After fixes | High |")
-        recommendations.append("| 🔧 High | Add monitoring alerts | 1 week | Medium |")
-        recommendations.append("| 🔧 High | Optimize ISM policies | 2 weeks | Medium |")
-        recommendations.append("| 📈 Medium | Scale cluster resources | 2-4 weeks | High |")
-        recommendations.append("| 📈 Medium | Implement hot-warm-cold | 1-3 months | High |")
-        recommendations.append("")
-        
-        recommendations.append("## 🔍 Monitoring Commands")
-        recommendations.append("")
-        recommendations.append("Use these commands to monitor the situation after implementing fixes:")
-        recommendations.append("")
-        recommendations.append("```bash")
-        recommendations.append("# Check ISM policy status")
-        recommendations.append("GET /_plugins/_ism/explain")
-        recommendations.append("")
-        recommendations.append("# Monitor circuit breaker usage")
-        recommendations.append("GET /_nodes/stats/breaker")
-        recommendations.append("")
-        recommendations.append("# Check cluster health")
-        recommendations.append("GET /_cluster/health")
-        recommendations.append("")
-        recommendations.append("# Monitor index sizes")
-        recommendations.append("GET /_cat/indices?v&s=store.size:desc")
-        recommendations.append("")
-        recommendations.append("# Check fielddata usage")
-        recommendations.append("GET /_cat/fielddata?v")
-        recommendations.append("```")
-        
-        recommendations_text = "\n".join(recommendations)
-        
-        # Save to file if specified
-        if output_file:
-            try:
-                with open(output_file, 'w') as f:
-                    f.write(recommendations_text)
-                print(f"✅ Recommendations saved to: {output_file}")
-            except Exception as e:
-                print(f"❌ Error saving recommendations: {e}")
+        yield "## 📅 Implementation Timeline"
+        yield ""
+        yield "| Priority | Action | Timeline | Impact |"
+        yield "|----------|--------|----------|--------|"
+        yield "| 🚨 Critical | Increase circuit breaker limits | Immediate | High |"
+        yield "| 🚨 Critical | Clear fielddata cache | Immediate | High |"
+        yield "| 🚨 Critical | Re-enable failed indices | After fixes | High |"
+        yield "| 🔧 High | Add monitoring alerts | 1 week | Medium |"
+        yield "| 🔧 High | Optimize ISM policies | 2 weeks | Medium |"
+        yield "| 📈 Medium | Scale cluster resources | 2-4 weeks | High |"
+        yield "| 📈 Medium | Implement hot-warm-cold | 1-3 months | High |"
+        yield ""
         
-        return recommendations_text
+        yield "## 🔍 Monitoring Commands"
+        yield ""
+        yield "Use these commands to monitor the situation after implementing fixes:"
+        yield ""
+        yield "```bash"
+        yield "# Check ISM policy status"
+        yield "GET /_plugins/_ism/explain"
+        yield ""
+        yield "# Monitor circuit breaker usage"
+        yield "GET /_nodes/stats/breaker"
+        yield ""
+        yield "# Check cluster health"
+        yield "GET /_cluster/health"
+        yield ""
+        yield "# Monitor index sizes"
+        yield "GET /_cat/indices?v&s=store.size:desc"
+        yield ""
+        yield "# Check fielddata usage"
+        yield "GET /_cat/fielddata?v"
+        yield "```"
     
+    @timed_phase('analyze_all_indices')
     def analyze_all_indices(self) -> Dict:
-        """Analyze all indices in the data"""
-        if not self.data:
+        """Analyze all indices in the data.
+
+        The classification pass runs once per loaded dataset; later calls return
+        the cached results until load_data() or invalidate_analysis() is called.
+        """
+        if not self.has_data():
             return {}
         
-        total_indices = self.data.get('total_managed_indices', 0)
+        if self.analysis_results is not None:
+            return self.analysis_results
+        
+        self.invalidate_analysis()
         analyses = {}
         skipped_indices = []
         
-        for key, value in self.data.items():
-            if key != 'total_managed_indices' and isinstance(value, dict):
-                # Skip indices that start with a dot (system indices)
-                if key.startswith('.'):
-                    skipped_indices.append(key)
-                    continue
-                analyses[key] = self.analyze_index(key, value)
+        if self.workers > 1 and self.source is None and self.snapshot is None:
+            # Worker processes parse and classify byte ranges of the file themselves
+            total_indices = self._classify_in_parallel(analyses, skipped_indices)
+        else:
+            total_indices = self._classify_entries(analyses, skipped_indices)
         
-        return {
+        self.analysis_results = {
             'total_indices': total_indices,
             'analyzed_indices': len(analyses),
             'skipped_indices': len(skipped_indices),
@@ -553,143 +1661,462 @@ class ISMPolicyAnalyzer:
                 'successful': len(self.successful_indices)
             }
         }
+        self.metrics.record_analysis(self.analysis_results, self.failed_indices)
+        return self.analysis_results
+    
+    def _classify_entries(self, analyses: Dict[str, IndexAnalysis], skipped_indices: List[str]) -> int:
+        """Classify (or restore from the snapshot) every entry in this process; returns total_managed_indices"""
+        total_indices = 0
+        if self.snapshot is not None and self.stream and self.source is None:
+            # Streamed entries are fingerprinted by their raw text, and unchanged ones are not decoded
+            entries = iter_explain_entries(self.file_path, fingerprints=True, known=self.snapshot.known_text)
+        else:
+            entries = self.iter_entries()
+        
+        def index_entries() -> Iterator[Tuple]:
+            nonlocal total_indices
+            for entry in entries:
+                key, value = entry[0], entry[1]
+                if key == 'total_managed_indices':
+                    total_indices = value
+                elif isinstance(value, dict) or value is UNCHANGED_ENTRY:
+                    # Skip indices that start with a dot (system indices)
+                    if key.startswith('.'):
+                        skipped_indices.append(key)
+                        continue
+                    yield entry
+        
+        items = index_entries()
+        if self.snapshot is not None:
+            self.snapshot.start_run()
+            self.delta = {'has_baseline': self.snapshot.has_baseline, 'newly_failed': [], 'recovered': [],
+                          'newly_pending': [], 'reused': 0, 'reclassified': 0}
+            items = self._reuse_from_snapshot(items)
+        
+        for item in items:
+            analysis = item if isinstance(item, IndexAnalysis) else self.classify_index(item[0], item[1])
+            analyses[analysis.index] = analysis
+            self._record_analysis(analysis)
+            if self.snapshot is not None:
+                self._track_delta(analysis)
+        
+        if self.snapshot is not None:
+            self.snapshot.commit()
+        return total_indices
+    
+    def _reuse_from_snapshot(self, entries: Iterable[Tuple]) -> Iterator:
+        """Yield a restored IndexAnalysis for entries whose fingerprint is unchanged, else the raw entry.
+
+        Entries are (key, value) or, when streaming, (key, value, fingerprint, raw text);
+        entries that need classification are passed on unchanged.
+        """
+        for entry in entries:
+            key, value = entry[0], entry[1]
+            previous = self.snapshot.lookup(key)
+            if len(entry) > 2:
+                fingerprint, text_length = entry[2], len(entry[3])
+            else:
+                fingerprint, text_length = fingerprint_entry(value), None
+            if previous is not None and previous[0] == fingerprint:
+                # Same classification as last run, so the status (and the delta) is unchanged
+                self.snapshot.keep(key)
+                self.delta['reused'] += 1
+                yield self._restore_analysis(key, None if value is UNCHANGED_ENTRY else value, previous[2])
+            else:
+                previous_status = self.snapshot.unpack(previous[2])[0] if previous else None
+                self._snapshot_inflight[key] = (fingerprint, previous_status, text_length,
+                                                value.get('index'), self._info_size(value))
+                self.delta['reclassified'] += 1
+                yield entry
     
+    def _restore_analysis(self, index_name: str, index_data: Optional[Dict], record: bytes) -> IndexAnalysis:
+        """Rebuild an analysis from a packed snapshot record without re-running classification.
+
+        Without index_data (the entry was not decoded) all fields come from the record.
+        """
+        (status, failure_reason, failure_class, breaker_type, pending_reason, conditions, consumed_retries,
+         last_retry, policy, state, enabled, operation, creation_date, index_field,
+         size_fallback) = self.snapshot.unpack(record)
+        if index_data is not None:
+            analysis = self._new_analysis(index_name, index_data)
+        else:
+            size = self.index_sizes.get(index_field) if index_field else None
+            analysis = IndexAnalysis(index=index_name, policy=policy, state=state, enabled=enabled,
+                                     operation=operation, creation_date=creation_date,
+                                     size=size if size is not None else size_fallback)
+        analysis.status = status
+        analysis.failure_reason = failure_reason
+        analysis.failure_class = failure_class
+        analysis.breaker_type = breaker_type
+        analysis.pending_reason = pending_reason
+        analysis.conditions = conditions
+        analysis.consumed_retries = consumed_retries
+        analysis.last_retry = last_retry
+        return analysis
+    
+    def _track_delta(self, analysis: IndexAnalysis):
+        """Store the new snapshot row and compare the status with the previous run"""
+        inflight = self._snapshot_inflight.pop(analysis.index, None)
+        if inflight is None:
+            # Restored from the snapshot
+            return
+        fingerprint, previous_status, text_length, index_field, size_fallback = inflight
+        self.snapshot.record(fingerprint, analysis, text_length, index_field, size_fallback)
+        if not self.delta['has_baseline']:
+            return
+        if analysis.status == STATUS_FAILED and previous_status != STATUS_FAILED:
+            self.delta['newly_failed'].append(analysis)
+        elif previous_status == STATUS_FAILED and analysis.status != STATUS_FAILED:
+            self.delta['recovered'].append(analysis)
+        if analysis.status == STATUS_PENDING and previous_status != STATUS_PENDING:
+            self.delta['newly_pending'].append(analysis)
+    
+    def _classify_in_parallel(self, analyses: Dict[str, IndexAnalysis], skipped_indices: List[str]) -> int:
+        """Classify the dump in a process pool where each task parses its own byte range of the file.
+
+        Range boundaries are arbitrary byte offsets, so every worker but the first looks
+        for its first entry itself (see _classify_byte_range). A guess is only accepted
+        if it is exactly where the previous range stopped; otherwise the range is parsed
+        again from that offset, so the result is the same as a serial pass. Workers return
+        compact analysis rows, and at most two ranges per worker are in flight.
+        Returns total_managed_indices.
+        """
+        from concurrent.futures import ProcessPoolExecutor
+        size = os.path.getsize(self.file_path)
+        range_bytes = max(1, min(self.range_bytes, -(-size // self.workers)))
+        bounds = list(range(0, size, range_bytes)) + [size]
+        ranges = iter(zip(bounds, bounds[1:]))
+        total_indices = 0
+        # Offset of the next top-level key; None once the closing brace has been parsed
+        expected = 0
+        in_flight = deque()
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_range_worker,
+                                 initargs=(self.index_sizes,)) as pool:
+            def submit(start: int, end: int, exact: bool):
+                return pool.submit(_classify_byte_range, self.file_path, start, end, exact)
+            
+            for start, end in islice(ranges, self.workers * 2):
+                in_flight.append((start, end, submit(start, end, start == 0)))
+            while in_flight:
+                start, end, future = in_flight.popleft()
+                for next_start, next_end in islice(ranges, 1):
+                    in_flight.append((next_start, next_end, submit(next_start, next_end, False)))
+                first, stop, rows, range_total, range_skipped = marshal.loads(future.result())
+                if expected is None or expected >= end:
+                    # The object has ended, or an entry of an earlier range spans this whole range
+                    continue
+                if first != expected:
+                    first, stop, rows, range_total, range_skipped = marshal.loads(
+                        submit(expected, end, True).result())
+                expected = stop
+                if range_total is not None:
+                    total_indices = range_total
+                skipped_indices.extend(range_skipped)
+                for row in rows:
+                    analysis = IndexAnalysis.from_fields(row)
+                    analyses[analysis.index] = analysis
+                    self._record_analysis(analysis)
+        if expected is not None:
+            raise json.JSONDecodeError("Expecting ',' delimiter", '', size)
+        return total_indices
+    
+    @timed_phase('generate_report')
     def generate_report(self, output_file: Optional[str] = None) -> str:
-        """Generate comprehensive analysis report"""
-        if not self.data:
+        """Generate comprehensive analysis report.
+
+        With output_file the report is streamed to the file row by row and the path
+        is returned; otherwise the report text is returned.
+        """
+        if not self.has_data():
             return "❌ No data loaded. Please load data first."
         
+        self.analyze_all_indices()
+        return self._emit_document(self.iter_report_lines(), output_file, 'report')
+    
+    def iter_report_lines(self) -> Iterator[str]:
+        """Yield the analysis report Markdown document line by line"""
         results = self.analyze_all_indices()
         
-        report = []
-        report.append("# ISM Policy Analysis Report")
-        report.append(f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        report.append(f"**Source File:** {os.path.basename(self.file_path)}")
-        report.append("")
+        yield "# ISM Policy Analysis Report"
+        yield f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+        yield f"**Source File:** {self.source_name()}"
+        yield ""
         
         # Summary
-        report.append("## Executive Summary")
-        report.append(f"**Total Managed Indices:** {results['total_indices']}")
-        report.append(f"**Analyzed Indices:** {results['analyzed_indices']}")
+        yield "## Executive Summary"
+        yield f"**Total Managed Indices:** {results['total_indices']}"
+        yield f"**Analyzed Indices:** {results['analyzed_indices']}"
         if results['skipped_indices'] > 0:
-            report.append(f"**Skipped System Indices:** {results['skipped_indices']} (indices starting with '.')")
-        report.append(f"**Failed Operations:** {results['summary']['failed']} indices")
-        report.append(f"**Pending Operations:** {results['summary']['pending']} indices")
-        report.append(f"**Successful Operations:** {results['summary']['successful']} indices")
-        report.append("")
+            yield f"**Skipped System Indices:** {results['skipped_indices']} (indices starting with '.')"
+        yield f"**Failed Operations:** {results['summary']['failed']} indices"
+        yield f"**Pending Operations:** {results['summary']['pending']} indices"
+        yield f"**Successful Operations:** {results['summary']['successful']} indices"
+        yield ""
         
         # Show skipped indices if any
         if results['skipped_indices'] > 0:
-            report.append("### Skipped System Indices")
-            report.append("The following system indices (starting with '.') were excluded from analysis:")
+            yield "### Skipped System Indices"
+            yield "The following system indices (starting with '.') were excluded from analysis:"
             for idx_name in results['skipped_index_names']:
-                report.append(f"- `{idx_name}`")
-            report.append("")
+                yield f"- `{idx_name}`"
+            yield ""
         
         # Failed indices section
         if self.failed_indices:
-            report.append("## ❌ Failed Operations")
-            report.append("")
+            yield "## ❌ Failed Operations"
+            yield ""
             
             for i, idx in enumerate(self.failed_indices, 1):
-                report.append(f"### {i}. **{idx['index']}** - {idx['action'].get('name', 'Unknown').upper()} FAILED")
-                report.append(f"- **Policy:** {idx['policy']}")
-                report.append(f"- **State:** {idx['state']}")
-                report.append(f"- **Size:** {idx['size']}")
-                report.append(f"- **Enabled:** {idx['enabled']}")
-                report.append(f"- **Operation:** {idx['action'].get('name', 'Unknown')}")
-                report.append(f"- **Failure Reason:** {idx.get('failure_reason', 'Unknown')}")
+                yield f"### {i}. **{idx.index}** - {idx.operation.upper()} FAILED"
+                yield f"- **Policy:** {idx.policy}"
+                yield f"- **State:** {idx.state}"
+                yield f"- **Size:** {idx.size}"
+                yield f"- **Enabled:** {idx.enabled}"
+                yield f"- **Operation:** {idx.operation}"
+                yield f"- **Failure Reason:** {idx.failure_reason}"
                 
-                if 'consumed_retries' in idx:
-                    report.append(f"- **Retries Consumed:** {idx['consumed_retries']}")
+                if idx.consumed_retries is not None:
+                    yield f"- **Retries Consumed:** {idx.consumed_retries}"
                 
-                if idx.get('last_retry', 0) > 0:
-                    report.append(f"- **Last Retry:** {self.convert_timestamp(idx['last_retry'])}")
+                if idx.last_retry > 0:
+                    yield f"- **Last Retry:** {self.convert_timestamp(idx.last_retry)}"
                 
-                if idx.get('creation_date'):
-                    report.append(f"- **Created:** {self.convert_timestamp(idx['creation_date'])}")
+                if idx.creation_date:
+                    yield f"- **Created:** {self.convert_timestamp(idx.creation_date)}"
                 
-                report.append("")
+                yield ""
         
         # Pending indices section
         if self.pending_indices:
-            report.append("## ⏳ Pending Operations")
-            report.append("")
+            yield "## ⏳ Pending Operations"
+            yield ""
             
             # Group by operation type
-            rollover_pending = [idx for idx in self.pending_indices if idx['action'].get('name') == 'rollover']
-            transition_pending = [idx for idx in self.pending_indices if idx['action'].get('name') == 'transition']
+            rollover_pending = [idx for idx in self.pending_indices if idx.operation == 'rollover']
+            transition_pending = [idx for idx in self.pending_indices if idx.operation == 'transition']
             
             if rollover_pending:
-                report.append("### Pending Rollover Operations")
+                yield "### Pending Rollover Operations"
                 for idx in rollover_pending:
-                    report.append(f"**{idx['index']}** (Policy: {idx['policy']}, Size: {idx['size']})")
-                    if 'conditions' in idx:
-                        conditions = idx['conditions']
+                    yield f"**{idx.index}** (Policy: {idx.policy}, Size: {idx.size})"
+                    if idx.conditions is not None:
+                        conditions = idx.conditions
                         for condition, details in conditions.items():
                             if condition == 'min_index_age':
-                                report.append(f"  - Age: {details['current']} / {details['condition']} required")
+                                yield f"  - Age: {details['current']} / {details['condition']} required"
                             elif condition == 'min_size':
-                                report.append(f"  - Size: {details['current']} / {details['condition']} required")
-                    report.append("")
+                                yield f"  - Size: {details['current']} / {details['condition']} required"
+                    yield ""
             
             if transition_pending:
-                report.append("### Pending Transition Operations")
+                yield "### Pending Transition Operations"
                 for idx in transition_pending:
-                    report.append(f"**{idx['index']}** (Policy: {idx['policy']}, State: {idx['state']}, Size: {idx['size']})")
-                    report.append(f"  - Status: {idx.get('pending_reason', 'Evaluating conditions')}")
-                report.append("")
+                    yield f"**{idx.index}** (Policy: {idx.policy}, State: {idx.state}, Size: {idx.size})"
+                    yield f"  - Status: {idx.pending_reason}"
+                yield ""
+            
+            yield from self._iter_forecast_lines()
         
         # Next steps note
-        report.append("## 📋 Next Steps")
-        report.append("")
-        report.append("1. **Generate Recommendations**: Run with `--recommendations` flag for detailed action items")
-        report.append("2. **Monitor Progress**: Re-run analysis after implementing fixes")
-        report.append("3. **Set Up Alerts**: Implement monitoring for ISM policy failures")
-        report.append("")
+        yield "## 📋 Next Steps"
+        yield ""
+        yield "1. **Generate Recommendations**: Run with `--recommendations` flag for detailed action items"
+        yield "2. **Monitor Progress**: Re-run analysis after implementing fixes"
+        yield "3. **Set Up Alerts**: Implement monitoring for ISM policy failures"
+        yield ""
         
         # Detailed index table
-        report.append("## 📊 Detailed Index Status")
-        report.append("")
-        report.append("| Index | Policy | State | Size | Age (days) | Operation | Status | Enabled | Issue |")
-        report.append("|-------|--------|-------|------|------------|-----------|--------|---------|-------|")
-        
-        # Sort indices by status (failed first, then pending, then successful)
-        all_indices = self.failed_indices + self.pending_indices + self.successful_indices
-        
-        for idx in all_indices:
-            status_icon = "❌" if idx['status'] == 'FAILED' else "⏳" if idx['status'] == 'PENDING' else "✅"
-            operation = idx['action'].get('name', 'Unknown')
-            issue = idx.get('failure_reason', idx.get('pending_reason', 'None'))[:40]
+        yield "## 📊 Detailed Index Status"
+        yield ""
+        yield "| Index | Policy | State | Size | Age (days) | Operation | Status | Enabled | Issue |"
+        yield "|-------|--------|-------|------|------------|-----------|--------|---------|-------|"
+        
+        # Rows are ordered by status (failed first, then pending, then successful)
+        columns = self.get_columns()
+        
+        for row, idx in enumerate(columns.records):
+            status_icon = "❌" if idx.status == STATUS_FAILED else "⏳" if idx.status == STATUS_PENDING else "✅"
+            operation = idx.operation
+            issue = idx.issue[:40]
             if len(issue) > 37:
                 issue = issue[:37] + "..."
-            size_display = idx['size'][:15] if len(idx['size']) > 12 else idx['size']
-            policy_display = idx['policy'][:10] if len(idx['policy']) > 10 else idx['policy']
-            age_days = self.get_index_age_days(idx)
-            report.append(f"| {idx['index']} | {policy_display} | {idx['state']} | {size_display} | {age_days} | {operation} | {status_icon} {idx['status']} | {idx['enabled']} | {issue} |")
+            size_display = idx.size[:15] if len(idx.size) > 12 else idx.size
+            policy_display = idx.policy[:10] if len(idx.policy) > 10 else idx.policy
+            age_days = columns.age_display(row)
+            yield f"| {idx.index} | {policy_display} | {idx.state} | {size_display} | {age_days} | {operation} | {status_icon} {idx.status} | {idx.enabled} | {issue} |"
         
-        report.append("")
-        report.append("**Legend:**")
-        report.append("- ❌ FAILED: Operation failed and needs intervention")
-        report.append("- ⏳ PENDING: Operation waiting for conditions to be met")
-        report.append("- ✅ SUCCESS: Operation completed successfully")
+        yield ""
+        yield "**Legend:**"
+        yield "- ❌ FAILED: Operation failed and needs intervention"
+        yield "- ⏳ PENDING: Operation waiting for conditions to be met"
+        yield "- ✅ SUCCESS: Operation completed successfully"
+    
+    def iter_export_rows(self) -> Iterator[Tuple]:
+        """Yield one tuple per analyzed index in EXPORT_FIELDS order (failed, pending, then successful)"""
+        columns = self.get_columns()
+        for row, idx in enumerate(columns.records):
+            age_days = columns.age_at(row)
+            yield (idx.index, idx.policy, idx.state, idx.operation, idx.status, idx.failure_class,
+                   idx.breaker_type, columns.size_at(row), None if age_days is None else round(age_days, 3),
+                   idx.consumed_retries, idx.enabled)
+    
+    def export_records(self, output_file: str, fmt: Optional[str] = None) -> bool:
+        """Write per-index results as JSON Lines, CSV or Parquet (format inferred from the extension)"""
+        if not self.has_data():
+            print("❌ No data loaded.")
+            return False
         
-        report_text = "\n".join(report)
+        fmt = fmt or EXPORT_FORMATS.get(os.path.splitext(output_file)[1].lower())
+        if fmt not in EXPORT_FORMATS.values():
+            print(f"❌ Error: Unknown export format for '{output_file}' (use .jsonl, .csv or .parquet)")
+            return False
         
-        # Save to file if specified
-        if output_file:
-            try:
-                with open(output_file, 'w') as f:
-                    f.write(report_text)
-                print(f"✅ Report saved to: {output_file}")
-            except Exception as e:
-                print(f"❌ Error saving report: {e}")
+        rows = self.iter_export_rows()
+        try:
+            if fmt == 'parquet':
+                count = self._export_parquet(rows, output_file)
+            else:
+                with open(output_file, 'w', newline='', buffering=REPORT_BUFFER_SIZE) as f:
+                    if fmt == 'csv':
+                        import csv
+                        writer = csv.writer(f)
+                        writer.writerow(EXPORT_FIELDS)
+                        writer.writerows(rows)
+                    else:
+                        f.writelines(json.dumps(dict(zip(EXPORT_FIELDS, row))) + "\n" for row in rows)
+                count = len(self.failed_indices) + len(self.pending_indices) + len(self.successful_indices)
+        except ImportError:
+            print("❌ Error: Parquet export requires pyarrow (pip install pyarrow).")
+            return False
+        except Exception as e:
+            print(f"❌ Error saving export: {e}")
+            return False
+        
+        print(f"✅ Exported {count} indices ({fmt}) to: {output_file}")
+        return True
+    
+    def _export_parquet(self, rows: Iterator[Tuple], output_file: str) -> int:
+        """Write rows to a Parquet file in columnar record batches"""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        schema = pa.schema([
+            ('index', pa.string()), ('policy', pa.string()), ('state', pa.string()),
+            ('operation', pa.string()), ('status', pa.string()), ('failure_class', pa.string()),
+            ('breaker_type', pa.string()), ('size_bytes', pa.int64()), ('age_days', pa.float64()),
+            ('retries', pa.int64()), ('enabled', pa.bool_()),
+        ])
+        count = 0
+        with pq.ParquetWriter(output_file, schema) as writer:
+            while True:
+                batch = list(islice(rows, EXPORT_BATCH_SIZE))
+                if not batch:
+                    break
+                columns = [list(column) for column in zip(*batch)]
+                writer.write_batch(pa.record_batch(columns, schema=schema))
+                count += len(batch)
+        return count
+    
+    def generate_delta_report(self, output_file: Optional[str] = None) -> str:
+        """Generate a report of status changes since the previous snapshot"""
+        if not self.has_data():
+            return "❌ No data loaded. Please load data first."
+        if self.snapshot is None:
+            return "❌ No snapshot configured. Please run with a snapshot store."
+        
+        self.analyze_all_indices()
+        return self._emit_document(self.iter_delta_report_lines(), output_file, 'delta report')
+    
+    def iter_delta_report_lines(self) -> Iterator[str]:
+        """Yield the delta report Markdown document line by line"""
+        self.analyze_all_indices()
+        delta = self.delta
+        
+        yield "# ISM Policy Delta Report"
+        yield f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+        yield f"**Source File:** {self.source_name()}"
+        yield f"**Snapshot:** {self.snapshot.display_name}"
+        yield ""
+        
+        yield "## Summary"
+        if not delta['has_baseline']:
+            yield "No previous snapshot was found - this run has been recorded as the baseline."
+        yield f"**Newly Failed:** {len(delta['newly_failed'])} indices"
+        yield f"**Recovered:** {len(delta['recovered'])} indices"
+        yield f"**Newly Pending:** {len(delta['newly_pending'])} indices"
+        yield f"**Re-classified (changed since last run):** {delta['reclassified']} indices"
+        yield f"**Reused From Snapshot:** {delta['reused']} indices"
+        yield ""
+        
+        if delta['newly_failed']:
+            yield "## ❌ Newly Failed"
+            yield ""
+            yield "| Index | Policy | State | Operation | Failure Reason |"
+            yield "|-------|--------|-------|-----------|----------------|"
+            for idx in delta['newly_failed']:
+                yield f"| {idx.index} | {idx.policy} | {idx.state} | {idx.operation} | {idx.failure_reason} |"
+            yield ""
         
-        return report_text
+        if delta['recovered']:
+            yield "## ✅ Recovered"
+            yield ""
+            yield "| Index | Policy | State | Operation | Status |"
+            yield "|-------|--------|-------|-----------|--------|"
+            for idx in delta['recovered']:
+                yield f"| {idx.index} | {idx.policy} | {idx.state} | {idx.operation} | {idx.status} |"
+            yield ""
+        
+        if delta['newly_pending']:
+            yield "## ⏳ Newly Pending"
+            yield ""
+            yield "| Index | Policy | State | Operation | Pending Reason |"
+            yield "|-------|--------|-------|-----------|----------------|"
+            for idx in delta['newly_pending']:
+                yield f"| {idx.index} | {idx.policy} | {idx.state} | {idx.operation} | {idx.pending_reason} |"
+            yield ""
+    
+    def _iter_forecast_lines(self) -> Iterator[str]:
+        """Rollover forecast section of the detailed report"""
+        forecast = self.forecast_pending()
+        forecasts = forecast['forecasts']
+        yield "## 🔮 Rollover Forecast"
+        yield ""
+        yield ("An operation fires as soon as any of its conditions is met. Size-based estimates assume "
+               "the index keeps growing at its average rate since creation.")
+        yield ""
+        yield "| Due Within | Indices |"
+        yield "|------------|---------|"
+        etas = [eta for _, eta, _ in forecasts]
+        previous = 0
+        for days, label in FORECAST_HORIZONS:
+            count = bisect_right(etas, days)
+            yield f"| {label} | {count - previous} |"
+            previous = count
+        yield f"| Later | {len(etas) - previous} |"
+        yield f"| No estimate | {forecast['unknown']} |"
+        yield ""
+        
+        if forecasts:
+            yield "### Next Expected Operations"
+            yield ""
+            yield "| Index | Policy | Operation | Trigger | ETA |"
+            yield "|-------|--------|-----------|---------|-----|"
+            for idx, eta, trigger in forecasts[:FORECAST_ROWS]:
+                yield f"| {idx.index} | {idx.policy} | {idx.operation} | {trigger} | {format_eta(eta)} |"
+            yield ""
+        
+        if forecast['stuck']:
+            yield "### 🧱 Stuck Behind Unreachable Conditions"
+            yield ""
+            yield "| Index | Policy | Operation | Reason |"
+            yield "|-------|--------|-----------|--------|"
+            for idx, reason in forecast['stuck']:
+                yield f"| {idx.index} | {idx.policy} | {idx.operation} | {reason} |"
+            yield ""
     
-    def print_summary(self):
-        """Print a quick summary to console"""
-        if not self.data:
+    def print_summary(self, forecast: bool = False):
+        """Print a quick summary to console (with forecast, also the rollover forecast counts)"""
+        if not self.has_data():
             print("❌ No data loaded.")
             return
         
@@ -698,7 +2125,7 @@ class ISMPolicyAnalyzer:
         print("="*60)
         print("🔍 ISM POLICY ANALYSIS SUMMARY")
         print("="*60)
-        print(f"📁 File: {os.path.basename(self.file_path)}")
+        print(f"📁 File: {self.source_name()}")
         print(f"📊 Total Indices: {results['total_indices']}")
         print(f"🔍 Analyzed Indices: {results['analyzed_indices']}")
         if results['skipped_indices'] > 0:
@@ -716,14 +2143,575 @@ class ISMPolicyAnalyzer:
         if self.failed_indices:
             print("\n🚨 CRITICAL - Failed Indices:")
             for idx in self.failed_indices:
-                print(f"  • {idx['index']} - {idx.get('failure_reason', 'Unknown error')}")
+                print(f"  • {idx.index} - {idx.failure_reason}")
         
         if self.pending_indices:
             print(f"\n⏳ Pending Operations: {len(self.pending_indices)} indices")
+            if forecast:
+                # Builds the size/age columns and evaluates every pending index's conditions
+                pending_forecast = self.forecast_pending()
+                due_soon = sum(1 for _, eta, _ in pending_forecast['forecasts'] if eta <= FORECAST_HORIZONS[0][0])
+                print(f"  🔮 Due within {FORECAST_HORIZONS[0][1]}: {due_soon}, "
+                      f"stuck behind unreachable conditions: {len(pending_forecast['stuck'])}")
+        
+        if self.delta is not None:
+            print("\n🔁 Changes Since Last Snapshot:")
+            if not self.delta['has_baseline']:
+                print("  No previous snapshot - this run was recorded as the baseline.")
+            else:
+                print(f"  ❌ Newly Failed: {len(self.delta['newly_failed'])}")
+                print(f"  ✅ Recovered: {len(self.delta['recovered'])}")
+                print(f"  ⏳ Newly Pending: {len(self.delta['newly_pending'])}")
+            print(f"  Re-classified: {self.delta['reclassified']}, reused from snapshot: {self.delta['reused']}")
         
         print("\n📄 Run with --report option to generate detailed report.")
 
 
+def count_statuses(file_path: str) -> Dict[str, int]:
+    """Count failed, pending and successful indices of an explain dump without a full analysis.
+
+    Entries are streamed and only action.failed and step.step_status are inspected,
+    with the same status rules as ISMPolicyAnalyzer.classify_index; no failure
+    parsing, sizes or report records are built.
+    """
+    counts = {'total_indices': 0, 'analyzed_indices': 0, 'skipped_indices': 0,
+              'failed': 0, 'pending': 0, 'successful': 0}
+    for key, value in iter_explain_entries(file_path):
+        if key == 'total_managed_indices':
+            counts['total_indices'] = value
+        elif isinstance(value, dict):
+            if key.startswith('.'):
+                counts['skipped_indices'] += 1
+                continue
+            counts['analyzed_indices'] += 1
+            step_status = value.get('step', {}).get('step_status')
+            if value.get('action', {}).get('failed', False) or step_status in ('failed', 'timed_out'):
+                counts['failed'] += 1
+            elif step_status == 'condition_not_met':
+                counts['pending'] += 1
+            else:
+                counts['successful'] += 1
+    return counts
+
+
+# Per-process analyzer used by _classify_byte_range in --workers mode
+_range_analyzer = None
+
+
+def _init_range_worker(index_sizes):
+    global _range_analyzer
+    _range_analyzer = ISMPolicyAnalyzer(file_path='')
+    _range_analyzer.index_sizes = index_sizes
+
+
+def _find_first_entry(file, start: int, end: int) -> Optional[int]:
+    """Guess the offset of the first top-level key in [start, end): a key whose object value names that index"""
+    file.seek(start)
+    # Index names are short, so a candidate starting before end is complete within a few hundred bytes more
+    region = file.read(end - start + 1024)
+    for match in ENTRY_CANDIDATE.finditer(region):
+        offset = start + match.start(1)
+        if offset >= end:
+            return None
+        file.seek(offset)
+        reader = _StreamingObjectReader(file)
+        try:
+            key = reader.decode_value()
+            reader.expect(':')
+            value = reader.decode_value()
+        except json.JSONDecodeError:
+            continue
+        if isinstance(value, dict) and value.get('index') == key:
+            return offset
+    return None
+
+
+def _decode_utf8(value: Any, text: str) -> Any:
+    """Re-decode a value read as latin-1 if its raw text holds non-ASCII (UTF-8) bytes"""
+    if text.isascii():
+        return value
+    return json.loads(text.encode('latin-1').decode('utf-8'))
+
+
+def _classify_byte_range(file_path: str, start: int, end: int, exact: bool) -> bytes:
+    """Parse and classify the top-level entries whose key starts in [start, end) of an explain dump.
+
+    The file is read as latin-1, so character offsets are byte offsets; entries with
+    non-ASCII bytes are decoded again as UTF-8. With exact, start is the opening brace
+    (0) or a top-level key. Otherwise the first entry is only guessed, and a guess that
+    cannot be parsed is returned as None instead of raising.
+
+    Returns the marshalled (start or the guessed offset of the first key, offset of the
+    first key at or after end or None at the end of the object, to_fields() rows, total_managed_indices or
+    None, skipped system index names).
+    """
+    with open(file_path, 'r', encoding='latin-1', newline='') as file:
+        first = start if exact else _find_first_entry(file, start, end)
+        if first is None:
+            return marshal.dumps((None, None, [], None, []))
+        file.seek(first)
+        reader = _StreamingObjectReader(file)
+        rows = []
+        skipped = []
+        total = None
+        try:
+            if first == 0:
+                reader.expect('{')
+                if reader.peek() == '}':
+                    return marshal.dumps((0, None, [], None, []))
+            while True:
+                if reader.peek() != '"':
+                    raise json.JSONDecodeError("Expecting property name enclosed in double quotes",
+                                               reader.buf, reader.pos)
+                offset = first + reader.offset + reader.pos
+                if offset >= end:
+                    stop = offset
+                    break
+                key = _decode_utf8(*reader.decode_value(with_text=True))
+                reader.expect(':')
+                value = _decode_utf8(*reader.decode_value(with_text=True))
+                if key == 'total_managed_indices':
+                    total = value
+                elif isinstance(value, dict):
+                    # Skip indices that start with a dot (system indices)
+                    if key.startswith('.'):
+                        skipped.append(key)
+                    else:
+                        rows.append(_range_analyzer.classify_index(key, value).to_fields())
+                separator = reader.peek()
+                if separator == '}':
+                    stop = None
+                    break
+                if separator != ',':
+                    raise json.JSONDecodeError("Expecting ','", reader.buf, reader.pos)
+                reader.pos += 1
+        except json.JSONDecodeError:
+            if exact:
+                raise
+            return marshal.dumps((None, None, [], None, []))
+    return marshal.dumps((first, stop, rows, total, skipped))
+
+
+def read_batch_manifest(manifest_path: str) -> List[Tuple[str, str, Optional[str]]]:
+    """Read a batch manifest with one '<explain.json> [<cat_indices.txt>]' pair per line.
+
+    Blank lines and lines starting with '#' are ignored; relative paths are resolved
+    against the manifest's directory. Returns (cluster name, dump path, cat path) tuples,
+    where the cluster name is the dump file name without extension.
+    """
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    clusters = []
+    seen_names = Counter()
+    with open(manifest_path, 'r') as f:
+        for line_no, line in enumerate(f, 1):
+            parts = line.split()
+            if not parts or parts[0].startswith('#'):
+                continue
+            if len(parts) > 2:
+                raise ValueError(f"{manifest_path}:{line_no}: expected '<explain.json> [<cat_indices.txt>]'")
+            dump_path, cat_path = (os.path.join(base_dir, p) for p in (parts + [''])[:2])
+            name = os.path.splitext(os.path.basename(dump_path))[0]
+            seen_names[name] += 1
+            if seen_names[name] > 1:
+                name = f"{name}-{seen_names[name]}"
+            clusters.append((name, dump_path, cat_path if len(parts) == 2 else None))
+    return clusters
+
+
+def _analyze_cluster(task: Tuple) -> Dict:
+    """Analyze one cluster dump in a batch worker and return a compact, picklable summary"""
+    name, dump_path, cat_path, stream, report_dir = task
+    summary = {'cluster': name, 'file': dump_path, 'error': None, 'total': 0, 'analyzed': 0, 'skipped': 0,
+               'failed': 0, 'pending': 0, 'successful': 0, 'failures_by_policy': Counter(),
+               'failures_by_breaker': Counter(), 'failures_by_class': Counter()}
+    # One bad dump (e.g. a top-level list instead of an object) must not abort the whole batch
+    try:
+        analyzer = ISMPolicyAnalyzer(dump_path, cat_path, stream=stream)
+        if not analyzer.load_data():
+            summary['error'] = 'Failed to load explain dump'
+            return summary
+        if not stream and not isinstance(analyzer.data, dict):
+            summary['error'] = 'Explain dump is not a JSON object'
+            return summary
+        results = analyzer.analyze_all_indices()
+        if results:
+            summary.update(total=results['total_indices'], analyzed=results['analyzed_indices'],
+                           skipped=results['skipped_indices'], **results['summary'])
+        for idx in analyzer.failed_indices:
+            summary['failures_by_policy'][idx.policy] += 1
+            summary['failures_by_class'][idx.failure_class] += 1
+            if idx.failure_class == FAILURE_CIRCUIT_BREAKER:
+                summary['failures_by_breaker'][idx.breaker_type or 'unknown'] += 1
+    except json.JSONDecodeError as e:
+        summary['error'] = f'Invalid JSON: {e}'
+        return summary
+    except Exception as e:
+        summary['error'] = f'Analysis failed: {type(e).__name__}: {e}'
+        return summary
+    
+    if report_dir:
+        analyzer.generate_report(os.path.join(report_dir, f"{name}_report.md"))
+    return summary
+
+
+def analyze_fleet(clusters: List[Tuple[str, str, Optional[str]]], workers: int, stream: bool = False,
+                  report_dir: Optional[str] = None) -> List[Dict]:
+    """Analyze many (name, dump, cat file) clusters in one process pool; summaries keep manifest order"""
+    from concurrent.futures import ProcessPoolExecutor
+    tasks = [(name, dump_path, cat_path, stream, report_dir) for name, dump_path, cat_path in clusters]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_analyze_cluster, tasks))
+
+
+def _fleet_breakdown(summaries: List[Dict], key: str) -> List[Tuple[str, int, int]]:
+    """Merge one per-cluster Counter into (value, failed indices, affected clusters) rows"""
+    totals = Counter()
+    clusters = Counter()
+    for summary in summaries:
+        totals.update(summary[key])
+        clusters.update(summary[key].keys())
+    return [(value, count, clusters[value]) for value, count in totals.most_common()]
+
+
+def iter_fleet_report_lines(summaries: List[Dict]) -> Iterator[str]:
+    """Yield the fleet-wide Markdown report line by line"""
+    loaded = [summary for summary in summaries if summary['error'] is None]
+    
+    yield "# ISM Fleet Analysis Report"
+    yield f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+    yield f"**Clusters:** {len(summaries)} ({len(summaries) - len(loaded)} could not be analyzed)"
+    yield ""
+    
+    yield "## Fleet Summary"
+    yield f"**Total Managed Indices:** {sum(summary['total'] for summary in loaded)}"
+    yield f"**Analyzed Indices:** {sum(summary['analyzed'] for summary in loaded)}"
+    yield f"**Failed Operations:** {sum(summary['failed'] for summary in loaded)} indices"
+    yield f"**Pending Operations:** {sum(summary['pending'] for summary in loaded)} indices"
+    yield f"**Successful Operations:** {sum(summary['successful'] for summary in loaded)} indices"
+    yield ""
+    
+    yield "## Clusters"
+    yield ""
+    yield "| Cluster | Analyzed | Failed | Pending | Successful | Circuit Breaker | Status |"
+    yield "|---------|----------|--------|---------|------------|-----------------|--------|"
+    for summary in sorted(summaries, key=lambda item: (-item['failed'], item['cluster'])):
+        if summary['error'] is not None:
+            yield f"| {summary['cluster']} | - | - | - | - | - | ❌ {summary['error']} |"
+            continue
+        status = "❌ Failures" if summary['failed'] else "⏳ Pending" if summary['pending'] else "✅ Healthy"
+        yield (f"| {summary['cluster']} | {summary['analyzed']} | {summary['failed']} | {summary['pending']} | "
+               f"{summary['successful']} | {summary['failures_by_class'][FAILURE_CIRCUIT_BREAKER]} | {status} |")
+    yield ""
+    
+    sections = (("Failures by Policy", "Policy", 'failures_by_policy'),
+                ("Failures by Circuit Breaker Type", "Breaker", 'failures_by_breaker'),
+                ("Failures by Class", "Class", 'failures_by_class'))
+    for title, column, key in sections:
+        rows = _fleet_breakdown(loaded, key)
+        if not rows:
+            continue
+        yield f"## {title}"
+        yield ""
+        yield f"| {column} | Failed Indices | Clusters |"
+        yield f"|{'-' * (len(column) + 2)}|----------------|----------|"
+        for value, count, cluster_count in rows:
+            yield f"| {value} | {count} | {cluster_count} |"
+        yield ""
+
+
+def print_fleet_summary(summaries: List[Dict]):
+    """Print a per-cluster overview of a batch run to console"""
+    print("=" * 60)
+    print("🌐 ISM FLEET ANALYSIS SUMMARY")
+    print("=" * 60)
+    for summary in summaries:
+        if summary['error'] is not None:
+            print(f"❌ {summary['cluster']}: {summary['error']}")
+        else:
+            print(f"📁 {summary['cluster']}: ❌ {summary['failed']}  ⏳ {summary['pending']}  ✅ {summary['successful']}")
+    print("=" * 60)
+    loaded = [summary for summary in summaries if summary['error'] is None]
+    print(f"❌ Failed: {sum(summary['failed'] for summary in loaded)}")
+    print(f"⏳ Pending: {sum(summary['pending'] for summary in loaded)}")
+    print(f"✅ Successful: {sum(summary['successful'] for summary in loaded)}")
+
+
+def run_batch(args) -> int:
+    """Handle --batch: analyze every cluster in the manifest and write the fleet report"""
+    try:
+        clusters = read_batch_manifest(args.batch)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error reading batch manifest: {e}")
+        return 1
+    missing = [dump_path for _, dump_path, _ in clusters if not os.path.exists(dump_path)]
+    if missing:
+        print(f"❌ Error: File '{missing[0]}' does not exist.")
+        return 1
+    if args.batch_report_dir:
+        os.makedirs(args.batch_report_dir, exist_ok=True)
+    
+    workers = args.workers or os.cpu_count() or 1
+    print(f"🌐 Analyzing {len(clusters)} clusters with {workers} workers...")
+    summaries = analyze_fleet(clusters, workers, stream=args.stream, report_dir=args.batch_report_dir)
+    print_fleet_summary(summaries)
+    
+    if args.fleet_report:
+        try:
+            with open(args.fleet_report, 'w', buffering=REPORT_BUFFER_SIZE) as f:
+                write_lines(iter_fleet_report_lines(summaries), f)
+            print(f"✅ Fleet report saved to: {args.fleet_report}")
+        except Exception as e:
+            print(f"❌ Error saving fleet report: {e}")
+            return 1
+    return 0
+
+
+class WatchMetrics:
+    """Live counters of a --watch process, rendered in the Prometheus text format"""
+
+    def __init__(self):
+        import threading
+        self.lock = threading.Lock()
+        self.runs = 0
+        self.last_file = None
+        self.last_run_timestamp = 0.0
+        self.last_run_duration = 0.0
+        self.status_counts = {'failed': 0, 'pending': 0, 'successful': 0}
+        self.skipped = 0
+        self.failures_by_class = Counter()
+        self.newly_failed_total = 0
+        self.recovered_total = 0
+        self.reclassified = 0
+        self.reused = 0
+        self.errors = 0
+        self.last_error = None
+
+    def record_error(self, dump_path: str, message: str):
+        with self.lock:
+            self.errors += 1
+            self.last_file = os.path.basename(dump_path)
+            self.last_error = message
+
+    def update(self, analyzer: 'ISMPolicyAnalyzer', results: Dict, duration: float):
+        with self.lock:
+            self.runs += 1
+            self.last_file = analyzer.source_name()
+            self.last_run_timestamp = time.time()
+            self.last_run_duration = duration
+            self.status_counts = dict(results['summary'])
+            self.skipped = results['skipped_indices']
+            self.failures_by_class = Counter(idx.failure_class for idx in analyzer.failed_indices)
+            if analyzer.delta is not None:
+                self.newly_failed_total += len(analyzer.delta['newly_failed'])
+                self.recovered_total += len(analyzer.delta['recovered'])
+                self.reclassified = analyzer.delta['reclassified']
+                self.reused = analyzer.delta['reused']
+
+    def render_prometheus(self) -> str:
+        with self.lock:
+            lines = [
+                "# HELP ism_analyzer_runs_total Explain dumps analyzed since start.",
+                "# TYPE ism_analyzer_runs_total counter",
+                f"ism_analyzer_runs_total {self.runs}",
+                "# HELP ism_analyzer_last_run_timestamp_seconds Unix time of the last completed analysis.",
+                "# TYPE ism_analyzer_last_run_timestamp_seconds gauge",
+                f"ism_analyzer_last_run_timestamp_seconds {self.last_run_timestamp:.3f}",
+                "# HELP ism_analyzer_last_run_duration_seconds Wall time of the last analysis.",
+                "# TYPE ism_analyzer_last_run_duration_seconds gauge",
+                f"ism_analyzer_last_run_duration_seconds {self.last_run_duration:.3f}",
+                "# HELP ism_analyzer_indices Managed indices by status in the latest dump.",
+                "# TYPE ism_analyzer_indices gauge",
+            ]
+            lines.extend(f'ism_analyzer_indices{{status="{status}"}} {count}'
+                         for status, count in self.status_counts.items())
+            lines.extend([
+                "# HELP ism_analyzer_skipped_indices System indices skipped in the latest dump.",
+                "# TYPE ism_analyzer_skipped_indices gauge",
+                f"ism_analyzer_skipped_indices {self.skipped}",
+                "# HELP ism_analyzer_failures Failed indices by failure class in the latest dump.",
+                "# TYPE ism_analyzer_failures gauge",
+            ])
+            lines.extend(f'ism_analyzer_failures{{class="{failure_class}"}} {count}'
+                         for failure_class, count in sorted(self.failures_by_class.items()))
+            lines.extend([
+                "# HELP ism_analyzer_newly_failed_total Indices that turned FAILED between consecutive dumps.",
+                "# TYPE ism_analyzer_newly_failed_total counter",
+                f"ism_analyzer_newly_failed_total {self.newly_failed_total}",
+                "# HELP ism_analyzer_recovered_total Indices that left FAILED between consecutive dumps.",
+                "# TYPE ism_analyzer_recovered_total counter",
+                f"ism_analyzer_recovered_total {self.recovered_total}",
+                "# HELP ism_analyzer_reclassified_indices Indices re-classified in the last run (changed fingerprint).",
+                "# TYPE ism_analyzer_reclassified_indices gauge",
+                f"ism_analyzer_reclassified_indices {self.reclassified}",
+                "# HELP ism_analyzer_reused_indices Indices reused from the in-memory snapshot in the last run.",
+                "# TYPE ism_analyzer_reused_indices gauge",
+                f"ism_analyzer_reused_indices {self.reused}",
+                "# HELP ism_analyzer_errors_total Explain dumps that could not be analyzed since start.",
+                "# TYPE ism_analyzer_errors_total counter",
+                f"ism_analyzer_errors_total {self.errors}",
+            ])
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> Dict:
+        with self.lock:
+            return {'runs': self.runs, 'last_file': self.last_file, 'last_run_timestamp': self.last_run_timestamp,
+                    'last_run_duration': self.last_run_duration, **self.status_counts,
+                    'newly_failed_total': self.newly_failed_total, 'recovered_total': self.recovered_total,
+                    'errors': self.errors, 'last_error': self.last_error}
+
+
+def start_metrics_server(metrics: WatchMetrics, host: str, port: int) -> 'ThreadingHTTPServer':
+    """Serve /metrics (Prometheus text) and / (JSON summary) from a daemon thread"""
+    import threading
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] == '/metrics':
+                body = metrics.render_prometheus().encode('utf-8')
+                content_type = 'text/plain; version=0.0.4; charset=utf-8'
+            elif self.path.split('?')[0] == '/':
+                body = json.dumps(metrics.summary()).encode('utf-8')
+                content_type = 'application/json'
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class ExplainDirectoryWatcher:
+    """Long-running watcher that analyzes the newest explain dump dropped into a directory.
+
+    New files are found by cheap mtime polling. Each dump is streamed and compared
+    against a snapshot kept across runs (in memory unless a snapshot file is given),
+    so only indices whose explain entry changed are re-classified.
+    """
+
+    def __init__(self, directory: str, pattern: str = '*.json', poll_interval: float = 30.0,
+                 settle_seconds: float = 2.0, index_size_csv: Optional[str] = None,
+                 snapshot: Optional[SnapshotStore] = None, metrics: Optional[WatchMetrics] = None,
+                 report_file: Optional[str] = None, delta_report_file: Optional[str] = None):
+        self.directory = directory
+        self.pattern = pattern
+        self.poll_interval = poll_interval
+        self.settle_seconds = settle_seconds
+        self.index_size_csv = index_size_csv
+        self.snapshot = snapshot or MemorySnapshotStore()
+        self.metrics = metrics or WatchMetrics()
+        self.report_file = report_file
+        self.delta_report_file = delta_report_file
+        self.last_seen = None
+
+    def find_new_dump(self) -> Optional[str]:
+        """Return the newest settled dump that is newer than the last one analyzed"""
+        import fnmatch
+        newest = None
+        settled_before = time.time() - self.settle_seconds
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if not entry.is_file() or not fnmatch.fnmatch(entry.name, self.pattern):
+                    continue
+                stat = entry.stat()
+                # Skip files that may still be being written by the exporter
+                if stat.st_mtime > settled_before:
+                    continue
+                key = (stat.st_mtime_ns, entry.name)
+                if (self.last_seen is None or key > self.last_seen) and (newest is None or key > newest[0]):
+                    newest = (key, entry.path)
+        if newest is None:
+            return None
+        self.last_seen = newest[0]
+        return newest[1]
+
+    def analyze(self, dump_path: str):
+        """Analyze one dump; a dump that cannot be analyzed is logged and counted, and watching continues"""
+        try:
+            self._analyze(dump_path)
+        except json.JSONDecodeError as e:
+            print(f"❌ Error: Invalid JSON format in '{dump_path}': {e}")
+            self.metrics.record_error(dump_path, f'Invalid JSON: {e}')
+        except Exception as e:
+            print(f"❌ Error analyzing '{dump_path}': {type(e).__name__}: {e}")
+            self.metrics.record_error(dump_path, f'{type(e).__name__}: {e}')
+
+    def _analyze(self, dump_path: str):
+        started = time.perf_counter()
+        analyzer = ISMPolicyAnalyzer(dump_path, self.index_size_csv, stream=True, snapshot=self.snapshot)
+        if not analyzer.load_data():
+            self.metrics.record_error(dump_path, 'Failed to load explain dump')
+            return
+        results = analyzer.analyze_all_indices()
+        self.metrics.update(analyzer, results, time.perf_counter() - started)
+        
+        delta = analyzer.delta
+        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {os.path.basename(dump_path)}: "
+              f"❌ {results['summary']['failed']} ⏳ {results['summary']['pending']} "
+              f"✅ {results['summary']['successful']} | newly failed {len(delta['newly_failed'])}, "
+              f"recovered {len(delta['recovered'])}, re-classified {delta['reclassified']}")
+        if self.report_file:
+            analyzer.generate_report(self.report_file)
+        if self.delta_report_file:
+            analyzer.generate_delta_report(self.delta_report_file)
+
+    def run(self, max_polls: Optional[int] = None):
+        """Poll until interrupted (or for max_polls iterations)"""
+        polls = 0
+        while max_polls is None or polls < max_polls:
+            dump_path = self.find_new_dump()
+            if dump_path:
+                self.analyze(dump_path)
+            polls += 1
+            if max_polls is None or polls < max_polls:
+                time.sleep(self.poll_interval)
+
+
+def run_watch(args) -> int:
+    """Handle --watch: analyze new dumps in a directory until interrupted"""
+    if not os.path.isdir(args.watch):
+        print(f"❌ Error: Directory '{args.watch}' does not exist.")
+        return 1
+    
+    snapshot = SnapshotStore(args.snapshot) if args.snapshot else None
+    metrics = WatchMetrics()
+    server = None
+    if args.metrics_port is not None:
+        server = start_metrics_server(metrics, args.metrics_host, args.metrics_port)
+        print(f"📈 Serving metrics on http://{args.metrics_host}:{server.server_address[1]}/metrics")
+    
+    watcher = ExplainDirectoryWatcher(args.watch, pattern=args.watch_pattern, poll_interval=args.poll_interval,
+                                      index_size_csv=args.index_size_csv, snapshot=snapshot, metrics=metrics, report_file=args.report,
+                                      delta_report_file=args.delta_report)
+    print(f"👀 Watching {args.watch} for '{args.watch_pattern}' every {args.poll_interval}s (Ctrl+C to stop)")
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        print("\n👋 Stopping watch mode.")
+    finally:
+        if server is not None:
+            server.shutdown()
+        watcher.snapshot.close()
+    return 0
+
+
+def default_metrics_path(args) -> str:
+    """<report>.metrics.json next to the first requested output file, else next to the input dump"""
+    base = args.report or args.recommendations or args.delta_report or args.export
+    if not base:
+        base = args.file_path if args.file_path else 'ism_cluster_analysis'
+    return os.path.splitext(base)[0] + '.metrics.json'
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Analyze Elasticsearch ISM policy JSON files",
@@ -734,48 +2722,192 @@ Examples:
   python ism_policy_analyzer.py policy.json --report analysis_report.md
   python ism_policy_analyzer.py policy.json --report analysis_report.md --recommendations recommendations.md
   python ism_policy_analyzer.py policy.json --summary --recommendations rec.md
+  python ism_policy_analyzer.py policy.json --summary --forecast
+  python ism_policy_analyzer.py policy.json --counts
+  python ism_policy_analyzer.py policy.json --stream --report analysis_report.md
+  python ism_policy_analyzer.py policy.json --stream --workers 8 --report analysis_report.md
+  python ism_policy_analyzer.py policy.json --snapshot ism_snapshot.db --delta-report delta.md
+  python ism_policy_analyzer.py --cluster https://localhost:9200 --cluster-auth admin:admin --summary
+  python ism_policy_analyzer.py policy.json --export indices.parquet
+  python ism_policy_analyzer.py --batch clusters.txt --fleet-report fleet.md --batch-report-dir reports/
+  python ism_policy_analyzer.py --watch /var/exports/ism --poll-interval 60 --metrics-port 9464
+  python ism_policy_analyzer.py policy.json --report analysis_report.md --metrics --profile
         """
     )
     
-    parser.add_argument('file_path', help='Path to the ISM policy JSON file')
+    parser.add_argument('file_path', nargs='?', help='Path to the ISM policy JSON file')
+    parser.add_argument('--cluster', help='Fetch _plugins/_ism/explain from this cluster URL instead of a file')
+    parser.add_argument('--index-pattern', action='append',
+                        help='Fetch only indices matching this pattern from --cluster (repeatable, should not overlap)')
+    parser.add_argument('--page-size', type=int, default=500, help='Indices per explain request with --cluster (default: 500)')
+    parser.add_argument('--fetch-concurrency', type=int, default=4,
+                        help='Concurrent explain requests with --cluster (default: 4)')
+    parser.add_argument('--cluster-auth', default=os.environ.get('ISM_CLUSTER_AUTH'),
+                        help='user:password for --cluster basic auth (default: $ISM_CLUSTER_AUTH)')
+    parser.add_argument('--insecure', action='store_true', help='Skip TLS certificate verification with --cluster')
     parser.add_argument('--index-size-csv', help='Path to index_size.csv file for index sizes')
     parser.add_argument('--report', '-r', help='Generate detailed report and save to file')
     parser.add_argument('--recommendations', '--rec', help='Generate recommendations and save to file')
     parser.add_argument('--summary', '-s', action='store_true', help='Print summary to console')
+    parser.add_argument('--forecast', action='store_true',
+                        help='Include the rollover forecast counts in the console summary (slower on large dumps)')
+    parser.add_argument('--counts', action='store_true',
+                        help='Only print failed/pending/successful counts from a quick scan (fastest, for scripts)')
+    parser.add_argument('--stream', action='store_true',
+                        help='Parse the explain dump incrementally instead of loading it all into memory')
+    parser.add_argument('--workers', '-w', type=int,
+                        help='Number of worker processes that parse and classify byte ranges of the dump '
+                             '(default: 1, or one per CPU with --batch; a file is always streamed with --workers; '
+                             'not used with --snapshot, --cluster or --watch)')
+    parser.add_argument('--snapshot', help='SQLite snapshot file; only indices changed since the last run are re-classified')
+    parser.add_argument('--delta-report',
+                        help='Generate a report of changes since the last snapshot (requires --snapshot, except '
+                             'with --watch, which compares each dump with the previous one)')
+    parser.add_argument('--batch', help='Manifest of "<explain.json> [<cat_indices.txt>]" lines to analyze as a fleet')
+    parser.add_argument('--fleet-report', help='Save the aggregated fleet report of a --batch run to this file')
+    parser.add_argument('--batch-report-dir', help='Also write a detailed report per cluster into this directory')
+    parser.add_argument('--watch', help='Watch a directory and analyze each new explain dump dropped into it')
+    parser.add_argument('--watch-pattern', default='*.json', help='File name pattern for --watch (default: *.json)')
+    parser.add_argument('--poll-interval', type=float, default=30.0,
+                        help='Seconds between directory scans with --watch (default: 30)')
+    parser.add_argument('--metrics-port', type=int,
+                        help='Expose live --watch counters on this port (/metrics in Prometheus format)')
+    parser.add_argument('--metrics-host', default='127.0.0.1', help='Bind address for --metrics-port (default: 127.0.0.1)')
+    parser.add_argument('--export', help='Export per-index results to a .jsonl, .csv or .parquet file')
+    parser.add_argument('--export-format', choices=sorted(set(EXPORT_FORMATS.values())),
+                        help='Format for --export (default: inferred from the file extension)')
+    parser.add_argument('--metrics', nargs='?', const='',
+                        help='Save per-phase timings and counters as JSON (default: next to the report)')
+    parser.add_argument('--profile', action='store_true',
+                        help='Capture cProfile and tracemalloc data into the --metrics JSON and a .prof file')
 
     args = parser.parse_args()
 
-    if not os.path.exists(args.file_path):
+    if args.workers is not None and args.workers < 1:
+        print("❌ Error: --workers must be at least 1.")
+        sys.exit(1)
+
+    if args.watch:
+        if args.file_path or args.cluster or args.batch:
+            print("❌ Error: --watch cannot be combined with a JSON file path, --cluster or --batch.")
+            sys.exit(1)
+        sys.exit(run_watch(args))
+
+    if args.batch:
+        if args.file_path or args.cluster:
+            print("❌ Error: --batch cannot be combined with a JSON file path or --cluster.")
+            sys.exit(1)
+        sys.exit(run_batch(args))
+
+    if bool(args.file_path) == bool(args.cluster):
+        print("❌ Error: Provide either a JSON file path, --cluster, --batch or --watch.")
+        sys.exit(1)
+
+    if args.file_path and not os.path.exists(args.file_path):
         print(f"❌ Error: File '{args.file_path}' does not exist.")
         sys.exit(1)
 
+    if args.counts:
+        if args.cluster or args.summary or args.report or args.recommendations or args.snapshot or args.export:
+            print("❌ Error: --counts only works on a JSON file and cannot be combined with other outputs.")
+            sys.exit(1)
+        try:
+            counts = count_statuses(args.file_path)
+        except json.JSONDecodeError as e:
+            print(f"❌ Error: Invalid JSON format in '{args.file_path}': {e}")
+            sys.exit(1)
+        print(" ".join(f"{key}={value}" for key, value in counts.items()))
+        return
+
+    if args.page_size < 1 or args.fetch_concurrency < 1:
+        print("❌ Error: --page-size and --fetch-concurrency must be at least 1.")
+        sys.exit(1)
+
+    # --watch (dispatched above) is exempt: without --snapshot it compares each dump with the previous one
+    if args.delta_report and not args.snapshot:
+        print("❌ Error: --delta-report requires --snapshot.")
+        sys.exit(1)
+
+    source = None
+    if args.cluster:
+        try:
+            source = ClusterExplainSource(args.cluster, page_size=args.page_size, concurrency=args.fetch_concurrency,
+                                          index_patterns=args.index_pattern, auth=args.cluster_auth,
+                                          verify_tls=not args.insecure)
+        except ValueError as e:
+            print(f"❌ Error: {e}")
+            sys.exit(1)
+
+    metrics_file = None
+    if args.metrics is not None or args.profile:
+        metrics_file = args.metrics or default_metrics_path(args)
+    metrics = RunMetrics()
+    if args.profile:
+        metrics.start_profiling()
+
     # Initialize analyzer with index size CSV if provided
-    analyzer = ISMPolicyAnalyzer(args.file_path, args.index_size_csv)
+    snapshot = SnapshotStore(args.snapshot) if args.snapshot else None
+    analyzer = ISMPolicyAnalyzer(args.file_path or args.cluster, args.index_size_csv, stream=args.stream,
+                                 workers=args.workers or 1, snapshot=snapshot, source=source, metrics=metrics)
 
     # Load data
     if not analyzer.load_data():
         sys.exit(1)
 
-    # Print summary if requested or no other output specified
-    if args.summary or (not args.report and not args.recommendations):
-        analyzer.print_summary()
-
-    # Generate report if requested
-    if args.report:
-        print(f"\n📝 Generating detailed report...")
-        report = analyzer.generate_report(args.report)
-        if not args.summary:
-            print("✅ Report generated!")
-
-    # Generate recommendations if requested
-    if args.recommendations:
-        print(f"\n🔧 Generating recommendations...")
-        recommendations = analyzer.generate_recommendations(args.recommendations)
-        if not args.summary:
-            print("✅ Recommendations generated!")
-
-    if not args.summary and (args.report or args.recommendations):
-        print("✅ Analysis complete!")
+    try:
+        # Print summary if requested or no other output specified
+        if args.summary or not (args.report or args.recommendations or args.delta_report or args.export):
+            analyzer.print_summary(forecast=args.forecast)
+
+        # Generate report if requested
+        if args.report:
+            print(f"\n📝 Generating detailed report...")
+            report = analyzer.generate_report(args.report)
+            if not args.summary:
+                print("✅ Report generated!")
+
+        # Generate recommendations if requested
+        if args.recommendations:
+            print(f"\n🔧 Generating recommendations...")
+            recommendations = analyzer.generate_recommendations(args.recommendations)
+            if not args.summary:
+                print("✅ Recommendations generated!")
+
+        # Generate delta report if requested
+        if args.delta_report:
+            print(f"\n🔁 Generating delta report...")
+            analyzer.generate_delta_report(args.delta_report)
+            if not args.summary:
+                print("✅ Delta report generated!")
+
+        # Export machine-readable results if requested
+        if args.export:
+            print(f"\n📦 Exporting per-index results...")
+            if not analyzer.export_records(args.export, args.export_format):
+                sys.exit(1)
+
+        # Save run metrics (and profiles) if requested
+        if metrics_file:
+            if args.profile:
+                metrics.stop_profiling(os.path.splitext(metrics_file)[0] + '.prof')
+            metrics.write(metrics_file, analyzer.source_name())
+            print(f"📈 Run metrics saved to: {metrics_file}")
+
+        if not args.summary and (args.report or args.recommendations or args.delta_report or args.export):
+            print("✅ Analysis complete!")
+
+    except json.JSONDecodeError as e:
+        # In streaming mode malformed JSON is only discovered during analysis
+        print(f"❌ Error: Invalid JSON format in '{args.file_path}': {e}")
+        sys.exit(1)
+    except ClusterFetchError as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+    finally:
+        if snapshot is not None:
+            snapshot.close()
+        if source is not None:
+            source.close()
 
 
 if __name__ == "__main__":
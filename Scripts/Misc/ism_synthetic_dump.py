@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Synthetic ISM Explain Dump Generator
+Generates seeded, realistic-looking `_plugins/_ism/explain` JSON dumps and matching
+`_cat/indices` text files for testing and benchmarking ism_policy_analyzer.py.
+
+Features:
+- Deterministic output for a given seed
+- Configurable index count, failure ratio, circuit breaker share and pending rollovers
+- Writes entries one at a time, so million-index dumps do not need to fit in memory
+
+Usage:
+    python ism_synthetic_dump.py --indices 100000 --output explain_100k.json --cat-output cat_100k.txt
+    python3 ism_synthetic_dump.py --indices 10000 --failure-ratio 0.2 --circuit-breaker-share 0.8 --seed 7 --output dev.json
+"""
+
+import json
+import random
+import sys
+import argparse
+from typing import Dict, Optional
+
+# Reference "now" so that generated dumps are identical for the same seed
+BASE_TIME_MS = 1760000000000
+DAY_MS = 86400000
+
+
+class SyntheticDumpGenerator:
+    def __init__(self, indices: int, seed: int = 42, failure_ratio: float = 0.1,
+                 circuit_breaker_share: float = 0.5, pending_rollover_ratio: float = 0.3,
+                 pending_transition_ratio: float = 0.1, system_ratio: float = 0.02,
+                 policies: int = 5, cat_coverage: float = 0.9):
+        self.indices = indices
+        self.seed = seed
+        self.failure_ratio = failure_ratio
+        self.circuit_breaker_share = circuit_breaker_share
+        self.pending_rollover_ratio = pending_rollover_ratio
+        self.pending_transition_ratio = pending_transition_ratio
+        self.system_ratio = system_ratio
+        self.policies = policies
+        self.cat_coverage = cat_coverage
+
+    def _circuit_breaker_failure(self, rng: random.Random) -> Dict:
+        limit = 31111669350
+        would_be = limit + rng.randint(1, 2 * 1024 ** 3)
+        real = would_be - rng.randint(1, 1024 ** 2)
+        breaker = rng.choice(['parent', 'parent', 'fielddata', 'request'])
+        reason = (f"[{breaker}] Data too large, data for [<transport_request>] would be "
+                  f"[{would_be}/{would_be / 1024 ** 3:.1f}gb], which is larger than the limit of "
+                  f"[{limit}/28.9gb], real usage: [{real}/{real / 1024 ** 3:.1f}gb], "
+                  f"new bytes reserved: [{would_be - real}/{(would_be - real) // 1024}kb]")
+        return {
+            "shard": rng.randint(0, 9),
+            "index": None,
+            "status": "TOO_MANY_REQUESTS",
+            "reason": {
+                "type": "circuit_breaking_exception",
+                "reason": reason,
+                "bytes_wanted": would_be,
+                "bytes_limit": limit,
+                "durability": "PERMANENT"
+            }
+        }
+
+    def generate_entry(self, rng: random.Random, position: int, name: str) -> Dict:
+        """Build one explain entry; the outcome is drawn from the configured ratios"""
+        created = BASE_TIME_MS - rng.randint(0, 90) * DAY_MS - rng.randint(0, DAY_MS)
+        entry = {
+            "index.plugins.index_state_management.policy_id": f"policy_{position % self.policies}",
+            "index.opendistro.index_state_management.policy_id": f"policy_{position % self.policies}",
+            "index": name,
+            "index_uuid": f"{rng.getrandbits(64):016x}",
+            "policy_id": f"policy_{position % self.policies}",
+            "policy_seq_no": 1,
+            "policy_primary_term": 1,
+            "rolled_over": False,
+            "index_creation_date": created,
+            "state": {"name": "hot", "start_time": created},
+            "enabled": True
+        }
+        roll = rng.random()
+        start = BASE_TIME_MS - rng.randint(0, 7 * DAY_MS)
+        if roll < self.failure_ratio:
+            if rng.random() < self.circuit_breaker_share:
+                entry["action"] = {"name": "rollover", "start_time": start, "index": 0, "failed": True,
+                                   "consumed_retries": rng.randint(0, 5), "last_retry_time": start + 60000}
+                entry["step"] = {"name": "attempt_rollover", "start_time": start, "step_status": "failed"}
+                entry["info"] = {"message": "Failed to rollover index",
+                                 "shard_failures": [self._circuit_breaker_failure(rng)]}
+            else:
+                entry["state"]["name"] = "warm"
+                entry["action"] = {"name": "warm_migration", "start_time": start, "index": 1,
+                                   "failed": False, "consumed_retries": 0, "last_retry_time": 0}
+                entry["step"] = {"name": "wait_for_warm_migration", "start_time": start, "step_status": "timed_out"}
+                entry["info"] = {"message": "Action timed out"}
+            entry["enabled"] = rng.random() > 0.5
+        elif roll < self.failure_ratio + self.pending_rollover_ratio:
+            entry["action"] = {"name": "rollover", "start_time": start, "index": 0, "failed": False,
+                               "consumed_retries": 0, "last_retry_time": 0}
+            entry["step"] = {"name": "attempt_rollover", "start_time": start, "step_status": "condition_not_met"}
+            entry["info"] = {
+                "message": f"Pending rollover of index [index={name}]",
+                "conditions": {
+                    "min_index_age": {"condition": "7d", "current": f"{rng.uniform(0, 7):.1f}d"},
+                    "min_size": {"condition": "480gb", "current": f"{rng.randint(0, 470)}gb"}
+                }
+            }
+        elif roll < self.failure_ratio + self.pending_rollover_ratio + self.pending_transition_ratio:
+            entry["action"] = {"name": "transition", "start_time": start, "index": 2, "failed": False,
+                               "consumed_retries": 0, "last_retry_time": 0}
+            entry["step"] = {"name": "attempt_transition_step", "start_time": start,
+                             "step_status": "condition_not_met"}
+            entry["info"] = {"message": f"Evaluating transition conditions [index={name}]"}
+        else:
+            entry["rolled_over"] = True
+            entry["action"] = {"name": "transition", "start_time": start, "index": 2, "failed": False,
+                               "consumed_retries": 0, "last_retry_time": 0}
+            entry["step"] = {"name": "attempt_transition_step", "start_time": start, "step_status": "completed"}
+            entry["info"] = {"message": f"Transitioning to warm [index={name}]"}
+        return entry
+
+    def index_name(self, rng: random.Random, position: int) -> str:
+        name = f"logs-app{position % 97}-{position:07d}"
+        return "." + name if rng.random() < self.system_ratio else name
+
+    def write(self, output_file: str, cat_output_file: Optional[str] = None):
+        """Write the explain dump (and optionally the _cat/indices file) entry by entry"""
+        rng = random.Random(self.seed)
+        size_rng = random.Random(self.seed + 1)
+        cat_file = open(cat_output_file, 'w') if cat_output_file else None
+        try:
+            if cat_file:
+                cat_file.write("health status index uuid pri rep docs.count docs.deleted store.size pri.store.size\n")
+            with open(output_file, 'w') as f:
+                f.write("{\n")
+                for position in range(self.indices):
+                    name = self.index_name(rng, position)
+                    entry = self.generate_entry(rng, position, name)
+                    f.write(f"  {json.dumps(name)}: {json.dumps(entry)},\n")
+                    if cat_file and size_rng.random() < self.cat_coverage:
+                        size_gb = size_rng.randint(1, 600)
+                        cat_file.write(f"green open {name} {entry['index_uuid']} 1 1 {size_gb * 1000} 0 "
+                                       f"{size_gb}gb {size_gb / 2:.1f}gb\n")
+                f.write(f'  "total_managed_indices": {self.indices}\n}}\n')
+        finally:
+            if cat_file:
+                cat_file.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate synthetic ISM explain dumps for testing and benchmarking",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python ism_synthetic_dump.py --indices 10000 --output explain_10k.json
+  python ism_synthetic_dump.py --indices 1000000 --output explain_1m.json --cat-output cat_1m.txt
+  python ism_synthetic_dump.py --indices 50000 --failure-ratio 0.3 --circuit-breaker-share 0.9 --output storm.json
+        """
+    )
+
+    parser.add_argument('--indices', '-n', type=int, default=10000, help='Number of managed indices (default: 10000)')
+    parser.add_argument('--output', '-o', required=True, help='Path of the explain JSON file to write')
+    parser.add_argument('--cat-output', help='Also write a matching _cat/indices text file')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed (default: 42)')
+    parser.add_argument('--failure-ratio', type=float, default=0.1, help='Fraction of failed indices (default: 0.1)')
+    parser.add_argument('--circuit-breaker-share', type=float, default=0.5,
+                        help='Fraction of failures caused by circuit breakers (default: 0.5)')
+    parser.add_argument('--pending-rollover-ratio', type=float, default=0.3,
+                        help='Fraction of indices waiting on rollover conditions (default: 0.3)')
+    parser.add_argument('--pending-transition-ratio', type=float, default=0.1,
+                        help='Fraction of indices waiting on transition conditions (default: 0.1)')
+    parser.add_argument('--system-ratio', type=float, default=0.02,
+                        help="Fraction of system indices starting with '.' (default: 0.02)")
+    parser.add_argument('--policies', type=int, default=5, help='Number of distinct policy ids (default: 5)')
+    parser.add_argument('--cat-coverage', type=float, default=0.9,
+                        help='Fraction of indices listed in the _cat/indices file (default: 0.9)')
+
+    args = parser.parse_args()
+
+    ratios = (args.failure_ratio, args.pending_rollover_ratio, args.pending_transition_ratio)
+    if any(r < 0 for r in ratios) or sum(ratios) > 1:
+        print("❌ Error: failure and pending ratios must be non-negative and add up to at most 1.")
+        sys.exit(1)
+
+    generator = SyntheticDumpGenerator(
+        indices=args.indices,
+        seed=args.seed,
+        failure_ratio=args.failure_ratio,
+        circuit_breaker_share=args.circuit_breaker_share,
+        pending_rollover_ratio=args.pending_rollover_ratio,
+        pending_transition_ratio=args.pending_transition_ratio,
+        system_ratio=args.system_ratio,
+        policies=args.policies,
+        cat_coverage=args.cat_coverage
+    )
+    generator.write(args.output, args.cat_output)
+    print(f"✅ Wrote {args.indices} indices to: {args.output}")
+    if args.cat_output:
+        print(f"✅ Wrote _cat/indices file to: {args.cat_output}")
+
+
+if __name__ == "__main__":
+    main()
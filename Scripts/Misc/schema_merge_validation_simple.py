@@ -3,6 +3,8 @@
 import json
 import sys
 import os
+import hashlib
+import time
 from datetime import datetime
 
 def merge_dicts_original(dict1, dict2):
@@ -39,6 +41,147 @@ def merge_dicts_strict(dict1, dict2, path="", collect_conflicts=False, conflicts
     
     return dict1, conflicts_list
 
+class SubtreeInterner:
+    """Hash-conses schema subtrees so equal subtrees (same content and key order) are stored once.
+
+    Interned dicts are shared between every place they are used, so they must be
+    copied before being modified (merge_dicts_shared does this).
+    """
+
+    def __init__(self):
+        self.table = {}
+        self.shared_ids = set()
+
+    def intern(self, value):
+        return self._intern(value)[0]
+
+    def _intern(self, value):
+        # Returns (canonical object, key); keys of containers are built from their interned children
+        if isinstance(value, dict):
+            items = [(k,) + self._intern(v) for k, v in value.items()]
+            key = ('d', tuple((k, child_key) for k, _, child_key in items))
+        elif isinstance(value, list):
+            items = [self._intern(v) for v in value]
+            key = ('l', tuple(child_key for _, child_key in items))
+        elif isinstance(value, float):
+            # 0.0 == -0.0, but they are written differently
+            return value, (float, repr(value))
+        else:
+            return value, (type(value), value)
+        canonical = self.table.get(key)
+        if canonical is None:
+            if isinstance(value, dict):
+                canonical = {k: child for k, child, _ in items}
+                self.shared_ids.add(id(canonical))
+            else:
+                canonical = [child for child, _ in items]
+            self.table[key] = canonical
+        return canonical, ('id', id(canonical))
+
+def merge_dicts_shared(dict1, dict2, interner):
+    """merge_dicts_original for a schema whose subtrees may be shared through an interner.
+
+    Same result as merge_dicts_original, but new subtrees are interned instead of
+    referenced and shared dicts are copied before they are modified. Returns the
+    merged dict1 (a copy if dict1 itself was shared).
+    """
+    holder = [dict1]
+    _merge_shared_into(holder, dict2, interner)
+    return holder[0]
+
+def _merge_shared_into(holder, dict2, interner):
+    shared_ids = interner.shared_ids
+    for k in dict2.keys():
+        dict1 = holder[0]
+        if k not in dict1:
+            if id(dict1) in shared_ids:
+                dict1 = holder[0] = dict(dict1)
+            # Merging the new (equal) subtree into itself would be a no-op
+            dict1[k] = interner.intern(dict2[k])
+        elif type(dict1[k]) is dict:
+            child = [dict1[k]]
+            try:
+                _merge_shared_into(child, dict2[k], interner)
+            finally:
+                # Attach modified copies even on errors, like the in-place merge does
+                if child[0] is not dict1[k]:
+                    if id(dict1) in shared_ids:
+                        dict1 = holder[0] = dict(dict1)
+                    dict1[k] = child[0]
+
+def build_schema_index(schema_dict, ignore_required=False):
+    """Flatten the global schema's properties into a {path: value} map, built once per batch.
+
+    Paths are tuples of keys (a dotted string would be ambiguous for property names
+    that contain dots) and values are references into schema_dict, not copies.
+    With ignore_required, 'required' keys are skipped instead of copying the schema
+    without them.
+    """
+    schema_index = {}
+    
+    def index_recursive(obj, prefix):
+        for k, value in obj.items():
+            if ignore_required and k == 'required':
+                continue
+            current_path = prefix + (k,)
+            schema_index[current_path] = value
+            if isinstance(value, dict):
+                index_recursive(value, current_path)
+    
+    index_recursive(schema_dict["properties"], ())
+    return schema_index
+
+def find_conflicts_indexed(schema_index, event_properties, path=(), ignore_required=False):
+    """Collect the same conflicts as merge_dicts_strict(collect_conflicts=True) using a schema index.
+
+    Only the event's own paths are looked up, so the cost depends on the event size
+    and the global schema is neither re-parsed nor modified. With ignore_required the
+    result equals validating remove_required_fields() copies of both schemas, but
+    'required' keys are skipped during the walk instead (pass an index built with
+    ignore_required as well).
+    """
+    conflicts_list = []
+    
+    def find_recursive(obj, prefix):
+        for k in obj.keys():
+            if ignore_required and k == 'required':
+                continue
+            event_value = obj[k]
+            current_path = prefix + (k,)
+            if current_path not in schema_index:
+                # Key doesn't exist in global schema - this is fine
+                continue
+            global_value = schema_index[current_path]
+            if isinstance(global_value, dict) and isinstance(event_value, dict):
+                find_recursive(event_value, current_path)
+            elif global_value != event_value:
+                if ignore_required:
+                    if equal_ignoring_required(global_value, event_value):
+                        continue
+                    # Only conflicting values are copied, to report them without 'required'
+                    global_value = remove_required_fields(global_value, ignore_required)
+                    event_value = remove_required_fields(event_value, ignore_required)
+                conflicts_list.append(
+                    f"Schema conflict at '{'.'.join(current_path)}': Global={global_value} vs Event={event_value}")
+    
+    find_recursive(event_properties, path)
+    return conflicts_list
+
+def equal_ignoring_required(value1, value2):
+    """Compare two schema values as if remove_required_fields had been applied to both"""
+    if isinstance(value1, dict):
+        if not isinstance(value2, dict):
+            return False
+        keys1 = [k for k in value1 if k != 'required']
+        if len(keys1) != sum(1 for k in value2 if k != 'required'):
+            return False
+        return all(k in value2 and equal_ignoring_required(value1[k], value2[k]) for k in keys1)
+    if isinstance(value1, list):
+        if not isinstance(value2, list) or len(value1) != len(value2):
+            return False
+        return all(equal_ignoring_required(item1, item2) for item1, item2 in zip(value1, value2))
+    return value1 == value2
+
 def compare_schema_original(global_schema, event_schema):
     """Original compare_schema logic"""
     global_schema_json = json.loads(global_schema)
@@ -48,9 +191,10 @@ def compare_schema_original(global_schema, event_schema):
 
 def compare_schema_strict(global_schema, event_schema, collect_conflicts=False):
     """Strict validation compare_schema logic - now can collect all conflicts"""
-    global_schema_json = json.loads(global_schema)
-    event_schema_json = json.loads(event_schema)
-    
+    return compare_schema_strict_dicts(json.loads(global_schema), json.loads(event_schema), collect_conflicts)
+
+def compare_schema_strict_dicts(global_schema_json, event_schema_json, collect_conflicts=False):
+    """Dict version of compare_schema_strict; merges the event into global_schema_json in place"""
     if collect_conflicts:
         conflicts_list = []
         global_schema_json["properties"], conflicts_list = merge_dicts_strict(
@@ -65,11 +209,22 @@ def compare_schema_strict(global_schema, event_schema, collect_conflicts=False):
         return global_schema_json
 
 def load_schema_from_file(file_path):
-    """Load schema from JSON file"""
+    """Load schema from JSON file (compatibility wrapper returning a JSON string)"""
+    schema_dict = load_schema_dict(file_path)
+    if schema_dict is None:
+        return None
+    return json.dumps(schema_dict)
+
+def load_schema_dict(file_path, data=None):
+    """Load schema from JSON file as a dict - parsed once and never re-serialized
+
+    If the file's contents were already read, pass them as data and the file is not opened again.
+    """
     try:
+        if data is not None:
+            return json.loads(data)
         with open(file_path, 'r') as f:
-            schema_dict = json.load(f)
-            return json.dumps(schema_dict)
+            return json.load(f)
     except FileNotFoundError:
         print(f"❌ Error: Schema file not found: {file_path}")
         return None
@@ -77,6 +232,69 @@ def load_schema_from_file(file_path):
         print(f"❌ Error: Invalid JSON in file {file_path}: {e}")
         return None
 
+# Parsed global schemas (by file path and by JSON string) and their indexes, reused across events
+SCHEMA_CACHE_SIZE = 8
+_global_schema_cache = {}
+_schema_string_cache = {}
+_schema_index_cache = {}
+
+def load_global_schema(file_path, with_data=False):
+    """Load a global schema dict once and reuse it while the file is unchanged.
+
+    The returned dict is shared between callers and must not be modified.
+    With with_data, returns (schema dict, the file contents it was parsed from),
+    or (None, None) if the file cannot be loaded.
+    """
+    failed = (None, None) if with_data else None
+    try:
+        stat = os.stat(file_path)
+    except FileNotFoundError:
+        print(f"❌ Error: Schema file not found: {file_path}")
+        return failed
+    
+    cache_key = os.path.abspath(file_path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _global_schema_cache.get(cache_key)
+    if cached is None or cached[0] != signature:
+        try:
+            with open(file_path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            print(f"❌ Error: Schema file not found: {file_path}")
+            return failed
+        schema_dict = load_schema_dict(file_path, data)
+        if schema_dict is None:
+            return failed
+        if len(_global_schema_cache) >= SCHEMA_CACHE_SIZE:
+            _global_schema_cache.clear()
+        cached = _global_schema_cache[cache_key] = (signature, schema_dict, data)
+    return cached[1:] if with_data else cached[1]
+
+def parse_schema_string(schema):
+    """json.loads a schema string once per distinct string (the result must not be modified)"""
+    schema_dict = _schema_string_cache.get(schema)
+    if schema_dict is None:
+        schema_dict = json.loads(schema)
+        if len(_schema_string_cache) >= SCHEMA_CACHE_SIZE:
+            _schema_string_cache.clear()
+        _schema_string_cache[schema] = schema_dict
+    return schema_dict
+
+def get_schema_index(global_schema_dict, ignore_required=False):
+    """Return the cached build_schema_index of a global schema dict (None if it has no properties)"""
+    cache_key = (id(global_schema_dict), ignore_required)
+    cached = _schema_index_cache.get(cache_key)
+    if cached is None:
+        if isinstance(global_schema_dict, dict) and "properties" in global_schema_dict:
+            schema_index = build_schema_index(global_schema_dict, ignore_required)
+        else:
+            schema_index = None
+        if len(_schema_index_cache) >= SCHEMA_CACHE_SIZE:
+            _schema_index_cache.clear()
+        # Keep a reference to the schema so its id() cannot be reused while cached
+        cached = _schema_index_cache[cache_key] = (global_schema_dict, schema_index)
+    return cached[1]
+
 def run_test(global_file, event_file, expected_to_fail=False, fail_on_conflict=False, test_name="Schema Merge Test"):
     """Run test with two schema files"""
     print(f"{'='*60}")
@@ -150,13 +368,35 @@ def read_event_list(list_file_path):
         print(f"❌ Error reading event list file: {e}")
         return None
 
-def validate_single_event(global_schema, event_file_path, events_folder, ignore_required=False):
-    """Validate a single event schema against global schema - now collects all conflicts"""
+def validate_single_event(global_schema, event_file_path, events_folder, ignore_required=False, global_index=None):
+    """Validate a single event schema against global schema - now collects all conflicts
+
+    Compatibility wrapper around validate_event_file for a global schema JSON string;
+    the string is parsed and indexed once and reused for every event. If global_index
+    (from get_schema_index) is given, the string is not used at all.
+    """
+    if global_index is None:
+        try:
+            global_index = get_schema_index(parse_schema_string(global_schema), ignore_required)
+        except Exception as e:
+            return {
+                'file': event_file_path,
+                'status': 'ERROR',
+                'error': f'Unexpected error during validation: {str(e)}',
+                'conflicts': []
+            }
+    return validate_event_file(global_index, event_file_path, events_folder, ignore_required)
+
+def validate_event_file(global_index, event_file_path, events_folder, ignore_required=False, event_data=None):
+    """Validate one event file against a global schema index - the event file is parsed exactly once
+
+    event_data is the file's contents if they were already read (e.g. to look them up in a ValidationCache).
+    """
     full_event_path = os.path.join(events_folder, event_file_path)
     
     # Load event schema
-    event_schema = load_schema_from_file(full_event_path)
-    if not event_schema:
+    event_schema_dict = load_schema_dict(full_event_path, data=event_data)
+    if event_schema_dict is None:
         return {
             'file': event_file_path,
             'status': 'ERROR',
@@ -164,28 +404,14 @@ def validate_single_event(global_schema, event_file_path, events_folder, ignore_
             'conflicts': []
         }
     
-    # Remove required fields if requested
-    if ignore_required:
-        try:
-            global_schema_dict = json.loads(global_schema)
-            event_schema_dict = json.loads(event_schema)
-            
-            global_schema_dict = remove_required_fields(global_schema_dict, ignore_required)
-            event_schema_dict = remove_required_fields(event_schema_dict, ignore_required)
-            
-            global_schema = json.dumps(global_schema_dict)
-            event_schema = json.dumps(event_schema_dict)
-        except Exception as e:
-            return {
-                'file': event_file_path,
-                'status': 'ERROR',
-                'error': f'Error processing required fields: {str(e)}',
-                'conflicts': []
-            }
-    
     # Test for conflicts - now collect all conflicts instead of failing on first
+    # ('required' fields are skipped during the walk when ignore_required is set)
     try:
-        merged_schema, conflicts_list = compare_schema_strict(global_schema, event_schema, collect_conflicts=True)
+        if global_index is None:
+            # Same failure as merging into a global schema without properties
+            raise KeyError('properties')
+        conflicts_list = find_conflicts_indexed(global_index, event_schema_dict["properties"],
+                                                ignore_required=ignore_required)
         
         if conflicts_list:
             return {
@@ -210,8 +436,157 @@ def validate_single_event(global_schema, event_file_path, events_folder, ignore_
             'conflicts': []
         }
 
-def batch_validate_events(global_file, events_folder, event_list_file, output_file, ignore_required=False):
-    """Validate multiple event schemas and generate conflict report"""
+# Per-process state of the parallel batch validation workers (set once by _init_validation_worker)
+_worker_state = {}
+
+def _init_validation_worker(global_schema_dict, events_folder, ignore_required):
+    """Index the global schema once per worker process"""
+    _worker_state['global_index'] = get_schema_index(global_schema_dict, ignore_required)
+    _worker_state['events_folder'] = events_folder
+    _worker_state['ignore_required'] = ignore_required
+
+def _validate_event_in_worker(event_file, event_data=None):
+    return validate_event_file(_worker_state['global_index'], event_file, _worker_state['events_folder'],
+                               _worker_state['ignore_required'], event_data)
+
+# Threads reading event files ahead of validation; each keeps up to PREFETCH_DEPTH files in flight
+PREFETCH_THREADS = 8
+PREFETCH_DEPTH = 4
+# Events submitted to the validation pool per worker ahead of the one being reported
+POOL_DEPTH = 4
+SLOWEST_LOADS_SHOWN = 5
+
+def _read_schema_bytes_timed(file_path):
+    start = time.perf_counter()
+    data = read_schema_bytes(file_path)
+    return data, time.perf_counter() - start
+
+def prefetch_schema_files(file_paths, threads=PREFETCH_THREADS):
+    """Yield (contents, load seconds) for each file path in order, reading ahead in a thread pool.
+
+    At most threads * PREFETCH_DEPTH reads are queued (and their contents held) at a
+    time, so slow network-mounted storage is read while the caller parses and
+    validates earlier files. Contents are None for files that cannot be read.
+    """
+    if threads < 1:
+        for file_path in file_paths:
+            yield _read_schema_bytes_timed(file_path)
+        return
+    from collections import deque
+    from concurrent.futures import ThreadPoolExecutor
+    paths = iter(file_paths)
+    pending = deque()
+    executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='schema-prefetch')
+    try:
+        for file_path in paths:
+            pending.append(executor.submit(_read_schema_bytes_timed, file_path))
+            if len(pending) >= threads * PREFETCH_DEPTH:
+                break
+        while pending:
+            loaded = pending.popleft().result()
+            file_path = next(paths, None)
+            if file_path is not None:
+                pending.append(executor.submit(_read_schema_bytes_timed, file_path))
+            yield loaded
+    finally:
+        # Also reached when the caller stops early; queued reads are dropped
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def print_load_latency(event_names, load_seconds):
+    """Print the total, average and slowest event file load times of a batch"""
+    timed = [(seconds, name) for name, seconds in zip(event_names, load_seconds) if seconds is not None]
+    if not timed:
+        return
+    total = sum(seconds for seconds, _ in timed)
+    print(f"   ⏱️  Event File Loads: {total:.3f}s total, {total / len(timed) * 1000:.1f} ms average")
+    for seconds, name in sorted(timed, reverse=True)[:SLOWEST_LOADS_SHOWN]:
+        print(f"      {seconds * 1000:8.1f} ms  {name}")
+
+# Bump when a change to the validation logic alters results, so older cached results are not reused
+VALIDATION_CACHE_VERSION = 1
+VALIDATION_CACHE_MAX_ENTRIES = 100000
+
+def schema_digest(data):
+    """Content digest of a schema file's bytes, used as validation cache key"""
+    return hashlib.sha256(data).hexdigest()
+
+def read_schema_bytes(file_path):
+    """Return a schema file's raw contents, or None if it cannot be read (validation reports why)"""
+    try:
+        with open(file_path, 'rb') as f:
+            return f.read()
+    except OSError:
+        return None
+
+class ValidationCache:
+    """SQLite-backed batch validation results, keyed by (global digest, event digest, ignore_required).
+
+    A result is reused while the global schema file, the event file and ignore_required
+    are unchanged, so a re-run only validates the events that changed. Each run marks
+    the entries it used; once there are more than max_entries, the entries least
+    recently used are evicted in close().
+    """
+
+    def __init__(self, path, max_entries=VALIDATION_CACHE_MAX_ENTRIES):
+        import sqlite3
+        self.path = path
+        self.max_entries = max_entries
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('CREATE TABLE IF NOT EXISTS results (global_digest TEXT, event_digest TEXT, '
+                          'ignore_required INTEGER, status TEXT, error TEXT, conflicts TEXT, last_used INTEGER, '
+                          'PRIMARY KEY (global_digest, event_digest, ignore_required))')
+        self.run = self.conn.execute('SELECT COALESCE(MAX(last_used), 0) + 1 FROM results').fetchone()[0]
+        self.hits = 0
+        self.misses = 0
+        self._used = []
+        self._rows = []
+
+    def global_digest(self, data):
+        # The cache version is part of the key, so results of older validation logic are never reused
+        return schema_digest(f"v{VALIDATION_CACHE_VERSION}:".encode() + data)
+
+    def lookup(self, global_digest, event_digest, ignore_required):
+        """Return the cached {'status', 'error', 'conflicts'} of an event, or None"""
+        key = (global_digest, event_digest, int(ignore_required))
+        row = self.conn.execute('SELECT status, error, conflicts FROM results WHERE global_digest = ? '
+                                'AND event_digest = ? AND ignore_required = ?', key).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._used.append(key)
+        return {'status': row[0], 'error': row[1], 'conflicts': json.loads(row[2])}
+
+    def store(self, global_digest, event_digest, ignore_required, result):
+        self._rows.append((global_digest, event_digest, int(ignore_required), result['status'], result['error'],
+                           json.dumps(result['conflicts']), self.run))
+
+    def close(self):
+        """Write this run's results and usage, evict the least recently used entries and close"""
+        with self.conn:
+            self.conn.executemany('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)', self._rows)
+            self.conn.executemany('UPDATE results SET last_used = ? WHERE global_digest = ? '
+                                  'AND event_digest = ? AND ignore_required = ?',
+                                  [(self.run,) + key for key in self._used])
+            excess = self.conn.execute('SELECT COUNT(*) FROM results').fetchone()[0] - self.max_entries
+            if excess > 0:
+                self.conn.execute('DELETE FROM results WHERE rowid IN '
+                                  '(SELECT rowid FROM results ORDER BY last_used LIMIT ?)', (excess,))
+        self._rows = []
+        self._used = []
+        self.conn.close()
+
+def batch_validate_events(global_file, events_folder, event_list_file, output_file, ignore_required=False, workers=1,
+                          cache_file=None, prefetch_threads=PREFETCH_THREADS):
+    """Validate multiple event schemas and generate conflict report
+
+    With workers > 1 the events are validated in a process pool; results keep the
+    order of the event list, so the report is the same as for a serial run.
+    With a cache_file, results of unchanged events are reused from earlier runs
+    (see ValidationCache) and only changed events are validated. Event files are
+    read by prefetch_threads threads ahead of validation (0 = read when needed), and
+    the summary lists the slowest file loads.
+    """
     print("=" * 80)
     print("BATCH SCHEMA VALIDATION")
     print("=" * 80)
@@ -220,11 +595,15 @@ def batch_validate_events(global_file, events_folder, event_list_file, output_fi
     print(f"Event List File: {event_list_file}")
     print(f"Output Report: {output_file}")
     print(f"Ignore Required Fields: {ignore_required}")
+    print(f"Workers: {workers}")
+    print(f"Prefetch Threads: {prefetch_threads}")
+    if cache_file:
+        print(f"Validation Cache: {cache_file}")
     print("=" * 80)
     
     # Load global schema
-    global_schema = load_schema_from_file(global_file)
-    if not global_schema:
+    global_schema_dict, global_data = load_global_schema(global_file, with_data=True)
+    if global_schema_dict is None:
         print("❌ Failed to load global schema. Aborting.")
         return
     
@@ -234,6 +613,13 @@ def batch_validate_events(global_file, events_folder, event_list_file, output_fi
         print("❌ Failed to read event list. Aborting.")
         return
     
+    # Index the global schema once instead of re-parsing it for every event
+    try:
+        global_index = get_schema_index(global_schema_dict, ignore_required)
+    except Exception as e:
+        print(f"❌ Failed to index global schema: {e}. Aborting.")
+        return
+    
     print(f"\n📋 Found {len(event_names)} events to validate:")
     for name in event_names:
         print(f"   - {name}")
@@ -242,27 +628,86 @@ def batch_validate_events(global_file, events_folder, event_list_file, output_fi
     results = []
     total_conflicts = 0
     
+    # Assume event files have .json extension if not provided
+    event_files = [name if name.endswith('.json') else f"{name}.json" for name in event_names]
+    
+    # Event files are read ahead by a thread pool while earlier events are validated
+    cache = None
+    if cache_file:
+        # The digest covers the bytes the global schema was parsed from
+        cache = ValidationCache(cache_file)
+        global_digest = cache.global_digest(global_data)
+    load_seconds = [None] * len(event_files)
+    
+    def look_up_events():
+        # Yields (contents, digest, cached result) per event; contents are None if unreadable
+        loaded = prefetch_schema_files([os.path.join(events_folder, f) for f in event_files], prefetch_threads)
+        for i, (data, seconds) in enumerate(loaded):
+            load_seconds[i] = seconds
+            if cache is None or data is None:
+                # Missing or unreadable files are validated (and reported) as usual
+                yield data, None, None
+                continue
+            event_digest = schema_digest(data)
+            # The bytes just hashed are the ones validated, even if the file changes meanwhile
+            yield data, event_digest, cache.lookup(global_digest, event_digest, ignore_required)
+    
+    pool = None
     print(f"\n🔄 Validating events...")
-    for event_name in event_names:
-        # Assume event files have .json extension if not provided
-        if not event_name.endswith('.json'):
-            event_file = f"{event_name}.json"
-        else:
-            event_file = event_name
-            
-        print(f"   Validating {event_name}...", end=" ")
+    if workers > 1:
+        from collections import deque
+        from concurrent.futures import ProcessPoolExecutor
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_validation_worker,
+                                   initargs=(global_schema_dict, events_folder, ignore_required))
+        
+        def submit_misses(entries, window):
+            # Misses go to the pool as they are read; up to `window` events are in flight
+            # ahead of the one being reported, and entries come back in list order
+            pending = deque()
+            for i, (data, event_digest, cached) in enumerate(entries):
+                future = None if cached is not None else pool.submit(_validate_event_in_worker, event_files[i], data)
+                pending.append((data, event_digest, cached, future))
+                if len(pending) >= window:
+                    yield pending.popleft()
+            while pending:
+                yield pending.popleft()
         
-        result = validate_single_event(global_schema, event_file, events_folder, ignore_required)
+        looked_up = submit_misses(look_up_events(), workers * POOL_DEPTH)
+    else:
+        looked_up = ((data, event_digest, cached, None) for data, event_digest, cached in look_up_events())
+    
+    for i, event_name in enumerate(event_names):
+        print(f"   Validating {event_name}...", end=" ", flush=True)
+        
+        data, event_digest, cached, future = next(looked_up)
+        if cached is not None:
+            result = dict(cached, file=event_files[i])
+            cached_note = " (cached)"
+        else:
+            if future is not None:
+                result = future.result()
+            else:
+                result = validate_event_file(global_index, event_files[i], events_folder, ignore_required, data)
+            cached_note = ""
+            # Load failures name the file's path, so they are validated again instead of cached
+            if event_digest is not None and result['error'] != \
+                    f"Failed to load event schema from {os.path.join(events_folder, event_files[i])}":
+                cache.store(global_digest, event_digest, ignore_required, result)
         results.append(result)
         
         if result['status'] == 'CONFLICT':
             conflict_count = len(result['conflicts'])
             total_conflicts += conflict_count
-            print(f"🚫 {conflict_count} conflict(s)")
+            print(f"🚫 {conflict_count} conflict(s){cached_note}")
         elif result['status'] == 'SUCCESS':
-            print("✅ OK")
+            print(f"✅ OK{cached_note}")
         else:
-            print(f"❌ {result['error']}")
+            print(f"❌ {result['error']}{cached_note}")
+    
+    if pool is not None:
+        pool.shutdown()
+    if cache is not None:
+        cache.close()
     
     # Generate report
     generate_conflict_report(results, output_file, global_file, events_folder, total_conflicts, ignore_required)
@@ -278,6 +723,9 @@ def batch_validate_events(global_file, events_folder, event_list_file, output_fi
     print(f"   🚫 Files with Conflicts: {conflict_files}")
     print(f"   🔍 Total Conflicts Found: {total_conflicts}")
     print(f"   ❌ Errors: {error_count}")
+    if cache is not None:
+        print(f"   ♻️  Reused from Cache: {cache.hits} (validated: {len(event_files) - cache.hits})")
+    print_load_latency(event_names, load_seconds)
     print(f"   📄 Report saved to: {output_file}")
 
 def generate_conflict_report(results, output_file, global_file, events_folder, total_conflicts, ignore_required=False):
@@ -338,32 +786,64 @@ def generate_conflict_report(results, output_file, global_file, events_folder, t
         f.write("=" * 80 + "\n")
 
 def remove_required_fields(schema_dict, ignore_required=False):
-    """Remove 'required' fields from schema if ignore_required is True"""
+    """Remove 'required' fields from schema if ignore_required is True
+
+    The original is not mutated, and it is not deep-copied either: only dicts and
+    lists that contain a 'required' key somewhere below are rebuilt, every other
+    subtree is shared with schema_dict.
+    """
     if not ignore_required:
         return schema_dict
     
-    # Create a deep copy to avoid mutating the original
-    import copy
-    schema_copy = copy.deepcopy(schema_dict)
-    
     def remove_required_recursive(obj):
         if isinstance(obj, dict):
-            # Remove 'required' key if it exists
-            if 'required' in obj:
-                del obj['required']
-            # Recursively process nested objects
+            # Drop 'required' and rebuild only if something below changed
+            changed = 'required' in obj
+            stripped = {}
             for key, value in obj.items():
-                remove_required_recursive(value)
+                if key == 'required':
+                    continue
+                new_value = remove_required_recursive(value)
+                changed = changed or new_value is not value
+                stripped[key] = new_value
+            return stripped if changed else obj
         elif isinstance(obj, list):
             # Process list items
-            for item in obj:
-                remove_required_recursive(item)
+            stripped = [remove_required_recursive(item) for item in obj]
+            return stripped if any(new is not old for new, old in zip(stripped, obj)) else obj
+        return obj
     
-    remove_required_recursive(schema_copy)
-    return schema_copy
+    return remove_required_recursive(schema_dict)
 
 def construct_global_schema_from_events(events_folder, event_names, ignore_required=False):
-    """Construct a global schema by merging all event schemas"""
+    """Construct a global schema by merging all event schemas (returns a JSON string and the log)"""
+    global_schema, construction_log = construct_global_schema_dict(events_folder, event_names, ignore_required)
+    return json.dumps(global_schema), construction_log
+
+def construct_global_schema_to_file(events_folder, event_names, output_file, ignore_required=False):
+    """Construct the global schema and write it straight to output_file (returns the construction log).
+
+    Event files are loaded one at a time, identical subtrees are stored once and the
+    result is encoded incrementally, so the schema is never held as one JSON string.
+    """
+    global_schema, construction_log = construct_global_schema_dict(events_folder, event_names, ignore_required,
+                                                                   share_subtrees=True)
+    write_schema_file(global_schema, output_file)
+    print(f"📄 Global schema saved to: {output_file}")
+    return construction_log
+
+def write_schema_file(schema_dict, output_file):
+    """Write a schema as JSON chunk by chunk (same text as json.dumps)"""
+    with open(output_file, 'w', buffering=1 << 16) as f:
+        for chunk in json.JSONEncoder().iterencode(schema_dict):
+            f.write(chunk)
+
+def construct_global_schema_dict(events_folder, event_names, ignore_required=False, share_subtrees=False):
+    """Construct a global schema dict by merging all event schemas, parsing each file once
+
+    With share_subtrees, merged subtrees are interned (see SubtreeInterner), so the
+    many identical objects repeated across events are kept in memory only once.
+    """
     print(f"\n🏗️  Constructing global schema from {len(event_names)} events...")
     
     global_schema = {
@@ -372,6 +852,7 @@ def construct_global_schema_from_events(events_folder, event_names, ignore_requi
     }
     
     construction_log = []
+    interner = SubtreeInterner() if share_subtrees else None
     
     for i, event_name in enumerate(event_names, 1):
         # Ensure .json extension
@@ -384,15 +865,13 @@ def construct_global_schema_from_events(events_folder, event_names, ignore_requi
         print(f"   [{i}/{len(event_names)}] Processing {event_name}...", end=" ")
         
         # Load event schema
-        event_schema = load_schema_from_file(full_event_path)
-        if not event_schema:
+        event_schema_dict = load_schema_dict(full_event_path)
+        if event_schema_dict is None:
             print(f"❌ Failed to load")
             construction_log.append(f"ERROR: Failed to load {event_file}")
             continue
             
         try:
-            event_schema_dict = json.loads(event_schema)
-            
             # Remove required fields if requested
             if ignore_required:
                 event_schema_dict = remove_required_fields(event_schema_dict, ignore_required)
@@ -400,10 +879,17 @@ def construct_global_schema_from_events(events_folder, event_names, ignore_requi
             # Extract properties if they exist
             if "properties" in event_schema_dict:
                 # Merge properties into global schema
-                global_schema["properties"] = merge_dicts_original(
-                    global_schema["properties"], 
-                    event_schema_dict["properties"]
-                )
+                if interner is not None:
+                    global_schema["properties"] = merge_dicts_shared(
+                        global_schema["properties"],
+                        event_schema_dict["properties"],
+                        interner
+                    )
+                else:
+                    global_schema["properties"] = merge_dicts_original(
+                        global_schema["properties"], 
+                        event_schema_dict["properties"]
+                    )
                 print(f"✅ Added {len(event_schema_dict['properties'])} properties")
                 construction_log.append(f"SUCCESS: Merged {len(event_schema_dict['properties'])} properties from {event_file}")
             else:
@@ -415,67 +901,14 @@ def construct_global_schema_from_events(events_folder, event_names, ignore_requi
             construction_log.append(f"ERROR: Failed to process {event_file}: {str(e)}")
     
     print(f"\n🎯 Global schema constructed with {len(global_schema['properties'])} total properties")
-    return json.dumps(global_schema), construction_log
+    return global_schema, construction_log
 
 def validate_event_against_constructed_schema(constructed_global_schema, event_file_path, events_folder, ignore_required=False):
-    """Validate a single event schema against the constructed global schema"""
-    full_event_path = os.path.join(events_folder, event_file_path)
-    
-    # Load event schema
-    event_schema = load_schema_from_file(full_event_path)
-    if not event_schema:
-        return {
-            'file': event_file_path,
-            'status': 'ERROR',
-            'error': f'Failed to load event schema from {full_event_path}',
-            'conflicts': []
-        }
-    
-    # Remove required fields if requested
-    if ignore_required:
-        try:
-            global_schema_dict = json.loads(constructed_global_schema)
-            event_schema_dict = json.loads(event_schema)
-            
-            global_schema_dict = remove_required_fields(global_schema_dict, ignore_required)
-            event_schema_dict = remove_required_fields(event_schema_dict, ignore_required)
-            
-            constructed_global_schema = json.dumps(global_schema_dict)
-            event_schema = json.dumps(event_schema_dict)
-        except Exception as e:
-            return {
-                'file': event_file_path,
-                'status': 'ERROR',
-                'error': f'Error processing required fields: {str(e)}',
-                'conflicts': []
-            }
-    
-    # Test for conflicts - collect all conflicts instead of failing on first
-    try:
-        merged_schema, conflicts_list = compare_schema_strict(constructed_global_schema, event_schema, collect_conflicts=True)
-        
-        if conflicts_list:
-            return {
-                'file': event_file_path,
-                'status': 'CONFLICT',
-                'error': f'Found {len(conflicts_list)} conflict(s)',
-                'conflicts': conflicts_list
-            }
-        else:
-            return {
-                'file': event_file_path,
-                'status': 'SUCCESS',
-                'error': None,
-                'conflicts': []
-            }
-            
-    except Exception as e:
-        return {
-            'file': event_file_path,
-            'status': 'ERROR',
-            'error': f'Unexpected error during validation: {str(e)}',
-            'conflicts': []
-        }
+    """Validate a single event schema against the constructed global schema (JSON string or dict)"""
+    if isinstance(constructed_global_schema, dict):
+        return validate_event_file(get_schema_index(constructed_global_schema, ignore_required),
+                                   event_file_path, events_folder, ignore_required)
+    return validate_single_event(constructed_global_schema, event_file_path, events_folder, ignore_required)
 
 if __name__ == "__main__":
     print("Schema Merge Validation Test - Batch Processing Version")
@@ -499,6 +932,15 @@ if __name__ == "__main__":
 
     ignore_required_fields = True  # 👈 Set to True to skip validation of 'required' sections
     
+    # Number of worker processes for batch validation (1 = validate events one after another)
+    parallel_workers = 1  # 👈 e.g. 4 to validate events in 4 processes
+    
+    # SQLite file with results of earlier runs; unchanged events are not validated again
+    validation_cache_file = None  # 👈 e.g. "/Path/to/schema_validation_cache.sqlite"
+    
+    # Threads reading event files ahead of validation (helps most on network-mounted storage)
+    prefetch_threads = PREFETCH_THREADS  # 👈 Set to 0 to read each file when it is validated
+    
     # ===================================
     # BATCH VALIDATION
     # ===================================
@@ -509,7 +951,10 @@ if __name__ == "__main__":
         events_folder=events_folder,
         event_list_file=event_list_file,
         output_file=output_report_file,
-        ignore_required=ignore_required_fields
+        ignore_required=ignore_required_fields,
+        workers=parallel_workers,
+        cache_file=validation_cache_file,
+        prefetch_threads=prefetch_threads
     )    
     print(f"\n{'📋 CONFIGURATION GUIDE':^80}")
     print("=" * 80)
@@ -523,6 +968,9 @@ if __name__ == "__main__":
     print("")
     print("⚙️  VALIDATION OPTIONS:")
     print("   ignore_required_fields = False  # Set to True to skip 'required' field validation")
+    print("   parallel_workers = 4  # Validate events in 4 processes (1 = serial)")
+    print("   validation_cache_file = 'path/to/cache.sqlite'  # Reuse results of unchanged events")
+    print("   prefetch_threads = 8  # Read event files ahead of validation (0 = off)")
     print("")
     print("📝 EVENT LIST FILE FORMAT:")
     print("   event1, event2, event3")